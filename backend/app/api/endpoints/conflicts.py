@@ -1,28 +1,94 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
+from typing import Optional
+from uuid import UUID
+from app.api.pagination import keyset_page, projected_columns
+from app.db.session import get_db
+from app.models import models
+from app.schemas import schemas
+from app.services.intelligence import IntelligenceService
+from app.services.embeddings import RequirementIndexService
 
 router = APIRouter()
 
-@router.get("/project/{project_id}", response_model=List[schemas.Conflict])
+LISTING_FIELDS = [
+    "id", "project_id", "req_a_id", "req_b_id", "conflict_type",
+    "severity_score", "resolution_summary", "is_resolved", "created_at"
+]
+# Response names of the aliased columns, accepted in `fields` as well
+FIELD_ALIASES = {"severity": "severity_score", "suggestion": "resolution_summary"}
+
+@router.get("/project/{project_id}", response_model=schemas.ConflictPage, response_model_exclude_unset=True)
 def get_project_conflicts(
     project_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,severity,req_a_id"),
+    resolved: bool = False,
+    conflict_type: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Trigger detection and return list of active conflicts for a project.
+    Return a page of a project's conflicts (open ones unless `resolved`),
+    newest first; pass `next_cursor` back as `cursor` for the next page.
+    Both requirements are embedded unless `fields` selects a projection.
+    Detection runs on the write path (ingestion, requirement creation) or via
+    the detect endpoint, never on reads.
     """
-    # 1. Trigger detection (In a real app, this might be async or background)
-    IntelligenceService.detect_conflicts(str(project_id), db)
-    
-    # 2. Fetch and return with joined requirements and stakeholders
-    conflicts = db.query(models.Conflict).options(
-        joinedload(models.Conflict.req_a).joinedload(models.Requirement.stakeholder),
-        joinedload(models.Conflict.req_b).joinedload(models.Requirement.stakeholder)
-    ).filter(
+    columns = projected_columns(models.Conflict, fields, LISTING_FIELDS, FIELD_ALIASES)
+    if columns is None:
+        query = db.query(models.Conflict).options(
+            joinedload(models.Conflict.req_a).joinedload(models.Requirement.stakeholder),
+            joinedload(models.Conflict.req_b).joinedload(models.Requirement.stakeholder)
+        )
+    else:
+        query = db.query(*columns)
+
+    query = query.filter(
         models.Conflict.project_id == project_id,
-        models.Conflict.is_resolved == False
-    ).all()
-    
-    return conflicts
+        models.Conflict.is_resolved == resolved
+    )
+    if conflict_type is not None:
+        query = query.filter(models.Conflict.conflict_type == conflict_type)
+
+    items, next_cursor = keyset_page(query, models.Conflict, cursor, limit)
+    if columns is not None:
+        items = [row._asdict() for row in items]
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.post("/project/{project_id}/detect")
+def detect_project_conflicts(
+    project_id: UUID,
+    full: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Run conflict detection for a project. Incremental (new requirements only)
+    unless `full` is set.
+    """
+    project = db.query(models.Project).filter(models.Project.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    detected = IntelligenceService.detect_conflicts(project_id, db, full=full)
+    return {"status": "success", "mode": "full" if full else "incremental", "conflicts_detected": len(detected)}
+
+@router.get("/project/{project_id}/candidates")
+def get_semantic_candidates(
+    project_id: UUID,
+    k: int = 5,
+    min_score: float = 0.5,
+    db: Session = Depends(get_db)
+):
+    """
+    Nearest-neighbour requirement pairs from the project's embedding index,
+    for semantic conflict review. O(n*k) pairs rather than all pairs.
+    """
+    pairs = RequirementIndexService.candidate_pairs(project_id, db, k=k, min_score=min_score)
+    return [
+        {"req_a_id": a, "req_b_id": b, "similarity": round(score, 4)}
+        for a, b, score in pairs
+    ]
 
 @router.post("/{conflict_id}/resolve")
 def resolve_conflict(
@@ -0,0 +1,54 @@
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from neo4j.exceptions import ServiceUnavailable
+from app.services.graph import get_graph_service
+
+router = APIRouter()
+
+# Handlers are async and use the async graph API, so slow graph queries wait
+# on the network without holding a threadpool worker.
+
+@router.get("/influence", response_model=List[Dict[str, Any]])
+async def get_influence(
+    project_id: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=500)
+):
+    """
+    Most influential stakeholders by influence score, then degree.
+    """
+    try:
+        return await get_graph_service().ainfluence(limit=limit, project_id=project_id)
+    except ServiceUnavailable:
+        raise HTTPException(status_code=503, detail="Graph database unavailable")
+
+@router.get("/path", response_model=List[str])
+async def get_shortest_path(
+    source: str,
+    target: str,
+    project_id: Optional[str] = None,
+    max_depth: int = Query(6, ge=1, le=10)
+):
+    """
+    Shortest communication path between two stakeholders.
+    """
+    try:
+        path = await get_graph_service().ashortest_path(source, target, max_depth=max_depth, project_id=project_id)
+    except ServiceUnavailable:
+        raise HTTPException(status_code=503, detail="Graph database unavailable")
+    if not path:
+        raise HTTPException(status_code=404, detail="No path found")
+    return path
+
+@router.get("/neighbourhood/{name}", response_model=List[Dict[str, Any]])
+async def get_neighbourhood(
+    name: str,
+    project_id: Optional[str] = None,
+    depth: int = Query(1, ge=1, le=4)
+):
+    """
+    Stakeholders and meetings within `depth` hops of a stakeholder.
+    """
+    try:
+        return await get_graph_service().aneighbourhood(name, depth=depth, project_id=project_id)
+    except ServiceUnavailable:
+        raise HTTPException(status_code=503, detail="Graph database unavailable")
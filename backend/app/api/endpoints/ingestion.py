@@ -1,11 +1,15 @@
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from uuid import UUID
+import asyncio
 import shutil
 import os
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.models import models
 from app.services.ai_pipeline import ai_processor
+from app.services.embeddings import RequirementIndexService
 
 from app.services.connectors.slack import SlackConnector
 from typing import Dict, Any
@@ -25,7 +29,7 @@ async def get_slack_messages(channel_id: str):
 async def get_gmail_messages(
     query: str = "label:inbox",
     max_results: int = 10,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Direct test endpoint to fetch emails from Gmail.
@@ -34,11 +38,11 @@ async def get_gmail_messages(
     from app.services.connectors.gmail import GmailConnector
     
     # Get first user for testing
-    user = db.query(models.User).first()
+    user = (await db.execute(select(models.User).limit(1))).scalars().first()
     if not user:
         raise HTTPException(status_code=404, detail="No user found. Please authenticate first.")
     
-    connector = GmailConnector(user_id=user.id, db=db)
+    connector = await db.run_sync(lambda session: GmailConnector(user_id=user.id, db=session))
     emails = await connector.fetch_data(query=query, max_results=max_results)
     return {
         "count": len(emails),
@@ -57,6 +61,15 @@ async def get_slack_channels():
         "channels": channels
     }
 
+@router.get("/llm-cache/stats")
+async def get_llm_cache_stats():
+    """
+    Hit/miss counters for the LLM response cache.
+    """
+    if not ai_processor.cache:
+        return {"enabled": False}
+    return {"enabled": True, **ai_processor.cache.stats()}
+
 UPLOAD_DIR = "uploads"
 if not os.path.exists(UPLOAD_DIR):
     os.makedirs(UPLOAD_DIR)
@@ -65,17 +78,19 @@ if not os.path.exists(UPLOAD_DIR):
 async def upload_document(
     project_id: UUID, 
     file: UploadFile = File(...), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # 1. Verify project exists
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
+    project = await db.get(models.Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     # 2. Save file locally (Placeholder for S3)
     file_path = os.path.join(UPLOAD_DIR, f"{project_id}_{file.filename}")
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    def save():
+        with open(file_path, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer)
+    await asyncio.to_thread(save)
 
     # 3. Simulate text extraction (Placeholder for actual PDF parsing)
     sample_text = f"Content from uploaded file: {file.filename}. "
@@ -99,7 +114,8 @@ async def upload_document(
         db.add(db_req)
         db_reqs.append(db_req)
     
-    db.commit()
+    await db.commit()
+    RequirementIndexService.schedule_sync(project_id)
 
     # 6. Detect Conflicts
     conflicts = await ai_processor.detect_conflicts(extracted_reqs)
@@ -114,39 +130,88 @@ async def upload_document(
         )
         db.add(db_conf)
     
-    db.commit()
+    await db.commit()
 
 from app.services.ingestion import IngestionService
-from typing import Dict, Any
+from app.services.jobs import job_manager
+
+SUPPORTED_CHANNELS = {"slack", "gmail", "enron", "ami"}
 
-@router.post("/{project_id}/channel")
+@router.post("/{project_id}/channel", status_code=202)
 async def ingest_from_channel(
     project_id: UUID,
     channel_data: Dict[str, Any],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Ingest requirements from a specific external channel (Slack, Gmail).
+    Queue ingestion of requirements from a specific external channel (Slack, Gmail).
+    Returns immediately with a job id; poll /ingest/jobs/{job_id} for progress.
     """
     # Verify project and get owner for token retrieval
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
+    project = await db.get(models.Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
+    if channel_data.get("type") not in SUPPORTED_CHANNELS:
+        raise HTTPException(status_code=400, detail="Unsupported channel type")
     
-    result = await IngestionService.ingest_from_channel(
+    job = await job_manager.submit(
+        db,
         project_id=project_id,
         channel_type=channel_data.get("type"),
         config=channel_data.get("config", {}),
-        db=db,
         user_id=project.owner_id
     )
-    if "error" in result:
-        raise HTTPException(status_code=400, detail=result["error"])
-    return result
+    return _serialize_job(job)
+
+@router.get("/jobs/{job_id}")
+def get_ingestion_job(job_id: UUID, db: Session = Depends(get_db)):
+    """
+    Status, current stage and progress (0-1) of an ingestion job.
+    """
+    job = db.query(models.IngestionJob).filter(models.IngestionJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _serialize_job(job)
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_ingestion_job(job_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    """
+    Cancel a queued or running ingestion job.
+    """
+    job = await job_manager.cancel(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _serialize_job(job)
+
+@router.get("/{project_id}/jobs")
+def list_ingestion_jobs(project_id: UUID, limit: int = 20, db: Session = Depends(get_db)):
+    """
+    Most recent ingestion jobs for a project.
+    """
+    jobs = db.query(models.IngestionJob).filter(
+        models.IngestionJob.project_id == project_id
+    ).order_by(models.IngestionJob.created_at.desc()).limit(limit).all()
+    return [_serialize_job(job) for job in jobs]
+
+def _serialize_job(job: models.IngestionJob) -> Dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "project_id": job.project_id,
+        "channel": job.channel_type,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": job.progress,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at
+    }
+
 @router.post("/seed-demo/{dataset_type}")
 async def seed_demo_dataset(
     dataset_type: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Creates a demo project and seeds it with realistic data from Enron or AMI.
@@ -158,8 +223,7 @@ async def seed_demo_dataset(
         description=f"Realistic simulation using the {dataset_type} corpus."
     )
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await db.commit()
 
     # 2. Trigger Ingestion Service
     # Note: IngestionService already handles requirements extraction and DB storage
@@ -1,12 +1,46 @@
 from typing import Any, Dict
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.models import models
 from app.services.intelligence import IntelligenceService
+from app.services.metrics import ProjectMetricsService
 
 router = APIRouter()
 
+@router.get("/portfolio", response_model=Dict[str, Any])
+def get_portfolio_intelligence(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    SAS, RSI, risk and conflict counts for every project the user owns.
+    A page costs the same fixed number of queries however many projects it holds.
+    """
+    owned = db.query(models.Project).filter(models.Project.owner_id == current_user.id)
+    total = owned.count()
+    projects = owned.order_by(models.Project.created_at.desc(), models.Project.id).offset(skip).limit(limit).all()
+    metrics = IntelligenceService.portfolio_metrics([p.id for p in projects], db)
+    
+    return {
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "projects": [
+            {
+                "project_id": str(project.id),
+                "name": project.name,
+                "alignment_score": round(metrics[project.id]["alignment_score"], 1),
+                "stability_index": round(metrics[project.id]["stability_index"], 1),
+                "risk_forecast": metrics[project.id]["risk_forecast"],
+                "requirement_count": metrics[project.id]["requirement_count"],
+                "open_conflicts": metrics[project.id]["open_conflicts"]
+            } for project in projects
+        ]
+    }
+
 @router.get("/{project_id}/summary", response_model=Dict[str, Any])
 def get_project_intelligence_summary(
     project_id: str,
@@ -20,14 +54,13 @@ def get_project_intelligence_summary(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
         
-    sas = IntelligenceService.calculate_alignment_score(project_id, db)
-    rsi = IntelligenceService.calculate_stability_index(project_id, db)
-    risk = IntelligenceService.get_risk_forecast(project_id, db)
+    # O(1) read of the project_metrics rollup maintained on the write path
+    summary = ProjectMetricsService.summary(project.id, db)
     
     return {
-        "alignment_score": round(sas, 1),
-        "stability_index": round(rsi, 1),
-        "risk_forecast": risk,
+        "alignment_score": round(summary["alignment_score"], 1),
+        "stability_index": round(summary["stability_index"], 1),
+        "risk_forecast": summary["risk_forecast"],
         "evolution_summary": "Extracted from 24 stakeholder interactions." # Mock summary
     }
 
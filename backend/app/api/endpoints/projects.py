@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
 from app.db.session import get_db
 from app.models import models
 from app.schemas import schemas
+from app.services.export import ENTITIES, ExportService, parse_entities
 
 router = APIRouter()
 
@@ -28,3 +30,41 @@ def read_project(project_id: UUID, db: Session = Depends(get_db)):
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
+
+@router.get("/{project_id}/export")
+def export_project(
+    project_id: UUID,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    entities: str = Query(",".join(ENTITIES), description="Comma-separated subset of requirements,conflicts,revisions"),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream the project's requirements, conflicts and revisions as NDJSON or
+    CSV, with constant memory whatever the project size.
+    """
+    project = db.query(models.Project).filter(models.Project.id == project_id).first()
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    try:
+        selected = parse_entities(entities)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    # The body is produced after this handler returns, so it reads through its
+    # own session on the same engine instead of the request-scoped one
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql":
+        # One snapshot across the three queries, however long the download takes
+        bind = bind.execution_options(isolation_level="REPEATABLE READ")
+    write = ExportService.stream_csv if format == "csv" else ExportService.stream_ndjson
+
+    def body():
+        with Session(bind=bind) as export_db:
+            yield from write(project, export_db, selected)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"project-{project_id}.{format}"
+    return StreamingResponse(
+        body(), media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
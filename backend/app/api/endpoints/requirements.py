@@ -1,30 +1,122 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional
 from uuid import UUID
+from app.api.pagination import keyset_page, projected_columns
 from app.db.session import get_db
 from app.models import models
 from app.schemas import schemas
+from app.services.bulk_import import BulkImportService, guess_format
+from app.services.embeddings import RequirementIndexService
+from app.services.intelligence import IntelligenceService
+from app.services.requirement_updates import RequirementUpdateService
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.Requirement])
-def read_all_requirements(db: Session = Depends(get_db)):
-    requirements = db.query(models.Requirement).all()
-    return requirements
+LISTING_FIELDS = [
+    "id", "project_id", "stakeholder_id", "text", "source_type", "source_ref",
+    "category", "priority_score", "sentiment_score", "status", "created_at"
+]
+
+def list_requirements(
+    db: Session,
+    project_id: Optional[UUID],
+    cursor: Optional[str],
+    limit: int,
+    fields: Optional[str],
+    category: Optional[str],
+    status: Optional[str],
+    source_type: Optional[str],
+    stakeholder_id: Optional[UUID]
+) -> dict:
+    columns = projected_columns(models.Requirement, fields, LISTING_FIELDS)
+    if columns is None:
+        query = db.query(models.Requirement).options(joinedload(models.Requirement.stakeholder))
+    else:
+        query = db.query(*columns)
+
+    filters = {
+        "project_id": project_id, "category": category, "status": status,
+        "source_type": source_type, "stakeholder_id": stakeholder_id
+    }
+    for name, value in filters.items():
+        if value is not None:
+            query = query.filter(getattr(models.Requirement, name) == value)
+
+    items, next_cursor = keyset_page(query, models.Requirement, cursor, limit)
+    if columns is not None:
+        # Plain dicts: absent keys stay unset, so the response carries only the projection
+        items = [row._asdict() for row in items]
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/", response_model=schemas.RequirementPage, response_model_exclude_unset=True)
+def read_all_requirements(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,text,category"),
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    source_type: Optional[str] = None,
+    stakeholder_id: Optional[UUID] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Requirements across all projects, newest first, one keyset page at a
+    time. Pass `next_cursor` back as `cursor` for the following page.
+    """
+    return list_requirements(db, None, cursor, limit, fields, category, status, source_type, stakeholder_id)
 
 @router.post("/", response_model=schemas.Requirement)
 def create_requirement(requirement: schemas.RequirementCreate, db: Session = Depends(get_db)):
     db_requirement = models.Requirement(**requirement.model_dump())
     db.add(db_requirement)
     db.commit()
+    RequirementIndexService.schedule_sync(db_requirement.project_id, db.get_bind())
+    # Score only the new requirement against the rest of the project
+    IntelligenceService.detect_conflicts(db_requirement.project_id, db)
     db.refresh(db_requirement)
     return db_requirement
 
-@router.get("/project/{project_id}", response_model=List[schemas.Requirement])
-def read_project_requirements(project_id: UUID, db: Session = Depends(get_db)):
-    requirements = db.query(models.Requirement).filter(models.Requirement.project_id == project_id).all()
-    return requirements
+@router.post("/bulk", response_model=schemas.BulkImportResult)
+def bulk_import_requirements(
+    project_id: UUID,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="Defaults to the file's extension"),
+    detect_conflicts: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Import requirements into a project from an NDJSON or CSV file (fields as
+    in RequirementImportRow; CSV takes them as header columns). Valid rows
+    are loaded in batches and invalid ones reported by row number.
+    `detect_conflicts` runs one incremental conflict pass afterwards.
+    """
+    project = db.query(models.Project).filter(models.Project.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    format = format or guess_format(file.filename, file.content_type)
+    if format is None:
+        raise HTTPException(status_code=400, detail="Cannot tell the file format; pass format=ndjson or format=csv")
+
+    return BulkImportService.import_requirements(project_id, file.file, format, db, detect_conflicts=detect_conflicts)
+
+@router.get("/project/{project_id}", response_model=schemas.RequirementPage, response_model_exclude_unset=True)
+def read_project_requirements(
+    project_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,text,category"),
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    source_type: Optional[str] = None,
+    stakeholder_id: Optional[UUID] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    A project's requirements, newest first, one keyset page at a time.
+    With `fields`, only those columns are loaded (no ORM objects, no stakeholder join).
+    """
+    return list_requirements(db, project_id, cursor, limit, fields, category, status, source_type, stakeholder_id)
 
 @router.get("/{requirement_id}", response_model=schemas.Requirement)
 def read_requirement(requirement_id: UUID, db: Session = Depends(get_db)):
@@ -32,32 +124,34 @@ def read_requirement(requirement_id: UUID, db: Session = Depends(get_db)):
     if requirement is None:
         raise HTTPException(status_code=404, detail="Requirement not found")
     return requirement
+
+@router.patch("/bulk", response_model=List[schemas.Requirement])
+def bulk_update_requirements(
+    batch: schemas.RequirementBulkUpdate,
+    db: Session = Depends(get_db)
+):
+    """
+    Apply field updates to many requirements in one transaction; every
+    changed field is logged as a revision. Nothing is applied if any id is
+    unknown. Returns the requirements in request order.
+    """
+    updates = {item.id: item.model_dump(exclude_unset=True, exclude={"id"}) for item in batch.updates}
+    if len(updates) != len(batch.updates):
+        raise HTTPException(status_code=400, detail="Each requirement may appear only once per batch")
+    try:
+        return RequirementUpdateService.apply(updates, db)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=f"Requirements not found: {', '.join(str(i) for i in exc.args)}")
+
 @router.put("/{requirement_id}", response_model=schemas.Requirement)
 def update_requirement(
     requirement_id: UUID, 
     requirement_update: schemas.RequirementUpdate, 
     db: Session = Depends(get_db)
 ):
-    db_requirement = db.query(models.Requirement).filter(models.Requirement.id == requirement_id).first()
-    if not db_requirement:
-        raise HTTPException(status_code=404, detail="Requirement not found")
-        
     update_data = requirement_update.model_dump(exclude_unset=True)
-    
-    for field, value in update_data.items():
-        old_val = getattr(db_requirement, field)
-        if old_val != value:
-            # Log Revision
-            revision = models.RequirementRevision(
-                requirement_id=requirement_id,
-                field_changed=field,
-                old_value=str(old_val),
-                new_value=str(value),
-                # changed_by=current_user.id (Would add this with auth)
-            )
-            db.add(revision)
-            setattr(db_requirement, field, value)
-            
-    db.commit()
-    db.refresh(db_requirement)
-    return db_requirement
+    try:
+        # changed_by=current_user.id (Would add this with auth)
+        return RequirementUpdateService.apply({requirement_id: update_data}, db)[0]
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Requirement not found")
@@ -1,49 +1,100 @@
-from typing import Any, List, Dict
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Any, List, Dict, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.models import models
+from app.services.sentiment_rollup import SentimentRollupService
 
 router = APIRouter()
 
 @router.get("/{project_id}", response_model=Dict[str, Any])
 def get_sentiment_overview(
-    project_id: str,
+    project_id: UUID,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     """
     Retrieve aggregated sentiment data for a project.
     """
-    # In a real app, this would perform a complex aggregation
-    # For now, we return structured mock data based on requirements in the DB
-    requirements = db.query(models.Requirement).filter(models.Requirement.project_id == project_id).all()
+    # Aggregated in SQL: one AVG overall and one AVG per source_type
+    overall, count = db.query(
+        func.avg(models.Requirement.sentiment_score),
+        func.count(models.Requirement.id)
+    ).filter(models.Requirement.project_id == project_id).one()
     
-    if not requirements:
+    if not count:
+        # Same shape as below: channels are only listed once they have requirements
         return {
             "overall_sentiment": 0.0,
-            "channel_breakdown": {
-                "gmail": 0.0,
-                "slack": 0.0,
-                "transcripts": 0.0
-            },
+            "channel_breakdown": {},
             "trend": []
         }
     
-    avg_sentiment = sum(r.sentiment_score for r in requirements) / len(requirements)
+    channel_breakdown = {
+        source_type or "unknown": round(avg, 2)
+        for source_type, avg in db.query(
+            models.Requirement.source_type,
+            func.avg(models.Requirement.sentiment_score)
+        ).filter(
+            models.Requirement.project_id == project_id
+        ).group_by(models.Requirement.source_type).all()
+        if avg is not None
+    }
+    
+    # Last seven days from the daily rollup
+    trend = [
+        {
+            "day": datetime.fromisoformat(point["bucket_start"]).strftime("%a"),
+            "date": point["bucket_start"][:10],
+            "score": round(point["avg_score"], 2)
+        }
+        for point in SentimentRollupService.trend(project_id, db, bucket="day")
+    ]
     
     return {
-        "overall_sentiment": round(avg_sentiment, 2),
-        "channel_breakdown": {
-            "gmail": 0.85,
-            "slack": 0.72,
-            "transcripts": 0.65
-        },
-        "trend": [
-            {"day": "Mon", "score": 0.6},
-            {"day": "Tue", "score": 0.65},
-            {"day": "Wed", "score": 0.7},
-            {"day": "Thu", "score": 0.75},
-            {"day": "Fri", "score": 0.72},
-        ]
+        "overall_sentiment": round(overall or 0.0, 2),
+        "channel_breakdown": channel_breakdown,
+        "trend": trend
     }
+
+@router.get("/{project_id}/trend", response_model=List[Dict[str, Any]])
+def get_sentiment_trend(
+    project_id: UUID,
+    bucket: str = Query("day", pattern="^(hour|day)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    group_by: str = Query("none", pattern="^(none|channel|stakeholder)$"),
+    source_type: Optional[str] = None,
+    stakeholder_id: Optional[UUID] = None,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Sentiment per hour or day bucket over [start, end), read from the rollup.
+    Defaults to the last 48 hours (hour) or 7 days (day).
+    """
+    if start and end and start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    return SentimentRollupService.trend(
+        project_id, db,
+        bucket=bucket,
+        start=start,
+        end=end,
+        group_by=group_by,
+        source_type=source_type,
+        stakeholder_id=stakeholder_id
+    )
+
+@router.post("/{project_id}/trend/rebuild", response_model=Dict[str, Any])
+def rebuild_sentiment_trend(
+    project_id: UUID,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Rebuild the rollup from sentiment pulses (backfill for data ingested before it existed).
+    """
+    return {"pulses": SentimentRollupService.rebuild(project_id, db)}
@@ -1,5 +1,6 @@
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.models import models
@@ -31,7 +32,11 @@ def create_stakeholder(
     """
     stakeholder = models.Stakeholder(**stakeholder_in.model_dump())
     db.add(stakeholder)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="A stakeholder with this name already exists in the project")
     db.refresh(stakeholder)
     return stakeholder
 
@@ -0,0 +1,63 @@
+"""
+Keyset (cursor) pagination for the listing endpoints.
+
+Pages are ordered newest first on (created_at, id). The cursor is the
+(created_at, id) of the last row returned. The next page is the range
+strictly after that row, so every page is one bounded index range scan,
+however deep the caller pages. OFFSET would instead re-scan every skipped row.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{id.hex}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(query: Query, model: Any, cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    One page of `query` (ORM objects or projected rows; both must carry
+    created_at and id) and the cursor for the next page, or None on the last.
+    """
+    if cursor:
+        query = query.filter(tuple_(model.created_at, model.id) < decode_cursor(cursor))
+    # One extra row tells whether another page exists without a COUNT
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def projected_columns(model: Any, fields: Optional[str], allowed: Iterable[str], aliases: Optional[dict] = None):
+    """
+    Columns for a `fields=a,b,c` projection, or None for full objects. id and
+    created_at are always included since the cursor is built from them.
+    `aliases` maps response field names to column names where they differ.
+    """
+    if not fields:
+        return None
+    aliases = aliases or {}
+    requested = [aliases.get(name.strip(), name.strip()) for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    names = ["id", "created_at"] + [name for name in requested if name not in ("id", "created_at")]
+    return [getattr(model, name) for name in dict.fromkeys(names)]
@@ -1,5 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.config import settings
+from app.api.endpoints import (
+    auth, oauth, projects, requirements, ingestion, stakeholders,
+    sentiment, intelligence, advisor, conflicts, graph
+)
+from app.services.jobs import job_manager
+from app.services.graph import close_graph_service
+from app.utils.batch_parser import shutdown_process_pool
+from app.services.embeddings import shutdown_index_sync
+from app.db.session import async_engine
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background ingestion workers live for the lifetime of the API process
+    await job_manager.start()
+    yield
+    await job_manager.stop()
+    shutdown_process_pool()
+    shutdown_index_sync()
+    await close_graph_service()
+    await async_engine.dispose()
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:3000"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
 app.include_router(oauth.router, prefix="/auth", tags=["oauth"])
 app.include_router(projects.router, prefix=f"{settings.API_V1_STR}/projects", tags=["projects"])
@@ -10,6 +43,7 @@ app.include_router(sentiment.router, prefix=f"{settings.API_V1_STR}/sentiment",
 app.include_router(intelligence.router, prefix=f"{settings.API_V1_STR}/intelligence", tags=["intelligence"])
 app.include_router(advisor.router, prefix=f"{settings.API_V1_STR}/advisor", tags=["advisor"])
 app.include_router(conflicts.router, prefix=f"{settings.API_V1_STR}/conflicts", tags=["conflicts"])
+app.include_router(graph.router, prefix=f"{settings.API_V1_STR}/graph", tags=["graph"])
 
 @app.get("/")
 def root():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Boolean, ForeignKey, DateTime, Text, JSON
+from sqlalchemy import Column, String, Float, Boolean, ForeignKey, DateTime, Date, Integer, Text, JSON, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -17,6 +17,9 @@ class User(Base):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_owner_id", "owner_id"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     name = Column(String, nullable=False)
@@ -30,6 +33,10 @@ class Project(Base):
 
 class Requirement(Base):
     __tablename__ = "requirements"
+    __table_args__ = (
+        Index("ix_requirements_project_created_id", "project_id", "created_at", "id"),
+        Index("ix_requirements_created_id", "created_at", "id"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"))
     stakeholder_id = Column(UUID(as_uuid=True), ForeignKey("stakeholders.id"), nullable=True) # Map to specific stakeholder
@@ -40,7 +47,7 @@ class Requirement(Base):
     priority_score = Column(Float, default=0.0)
     sentiment_score = Column(Float, default=0.0)
     status = Column(String, default="extracted")
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False) # keyset listing cursor
 
     project = relationship("Project", back_populates="requirements")
     revisions = relationship("RequirementRevision", back_populates="requirement")
@@ -48,6 +55,9 @@ class Requirement(Base):
 
 class SentimentPulse(Base):
     __tablename__ = "sentiment_pulses"
+    __table_args__ = (
+        Index("ix_sentiment_pulses_project_created", "project_id", "created_at"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"))
     stakeholder_id = Column(UUID(as_uuid=True), ForeignKey("stakeholders.id"))
@@ -59,8 +69,26 @@ class SentimentPulse(Base):
     project = relationship("Project")
     stakeholder = relationship("Stakeholder")
 
+class SentimentRollup(Base):
+    __tablename__ = "sentiment_rollups"
+    __table_args__ = (
+        Index("ix_sentiment_rollups_lookup", "project_id", "granularity", "bucket_start"),
+    )
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
+    granularity = Column(String, nullable=False) # hour, day
+    bucket_start = Column(DateTime, nullable=False)
+    source_type = Column(String) # channel, as on SentimentPulse
+    stakeholder_id = Column(UUID(as_uuid=True), ForeignKey("stakeholders.id"), nullable=True)
+    pulse_count = Column(Integer, default=0)
+    score_sum = Column(Float, default=0.0)
+    score_sumsq = Column(Float, default=0.0)
+
 class RequirementRevision(Base):
     __tablename__ = "requirement_revisions"
+    __table_args__ = (
+        Index("ix_requirement_revisions_requirement_created", "requirement_id", "created_at"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     requirement_id = Column(UUID(as_uuid=True), ForeignKey("requirements.id"))
     field_changed = Column(String)
@@ -73,6 +101,9 @@ class RequirementRevision(Base):
 
 class Stakeholder(Base):
     __tablename__ = "stakeholders"
+    __table_args__ = (
+        UniqueConstraint("project_id", "name", name="uq_stakeholders_project_name"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"))
     name = Column(String, nullable=False)
@@ -84,6 +115,9 @@ class Stakeholder(Base):
 
 class IntegrationToken(Base):
     __tablename__ = "integration_tokens"
+    __table_args__ = (
+        Index("ix_integration_tokens_user_provider", "user_id", "provider"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     provider = Column(String, nullable=False) # slack, google
@@ -96,6 +130,9 @@ class IntegrationToken(Base):
 
 class Conflict(Base):
     __tablename__ = "conflicts"
+    __table_args__ = (
+        Index("ix_conflicts_project_resolved_created", "project_id", "is_resolved", "created_at", "id"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"))
     req_a_id = Column(UUID(as_uuid=True), ForeignKey("requirements.id"))
@@ -104,7 +141,46 @@ class Conflict(Base):
     severity_score = Column(Float)
     resolution_summary = Column(Text)
     is_resolved = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False) # keyset listing cursor
 
     req_a = relationship("Requirement", foreign_keys=[req_a_id])
     req_b = relationship("Requirement", foreign_keys=[req_b_id])
+
+class ConflictWatermark(Base):
+    __tablename__ = "conflict_watermarks"
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), primary_key=True)
+    last_created_at = Column(DateTime) # Newest requirement created_at already scanned
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ProjectMetrics(Base):
+    __tablename__ = "project_metrics"
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), primary_key=True)
+    requirement_count = Column(Integer, default=0)
+    sentiment_mean = Column(Float, default=0.0) # Welford running mean of Requirement.sentiment_score
+    sentiment_m2 = Column(Float, default=0.0) # Welford sum of squared deviations
+    unresolved_conflict_count = Column(Integer, default=0)
+    unresolved_severity_sum = Column(Float, default=0.0) # sum of (severity_score or 0.5) over open conflicts
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ProjectRevisionBucket(Base):
+    __tablename__ = "project_revision_buckets"
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    revision_count = Column(Integer, default=0)
+
+class IngestionJob(Base):
+    __tablename__ = "ingestion_jobs"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"))
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    channel_type = Column(String, nullable=False) # slack, gmail, enron, ami
+    config = Column(Text) # Encrypted JSON (may carry channel tokens)
+    status = Column(String, default="queued") # queued, running, succeeded, failed, cancelled
+    stage = Column(String, default="queued")
+    progress = Column(Float, default=0.0) # 0 to 1
+    result = Column(JSON)
+    error = Column(Text)
+    cancel_requested = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
@@ -41,6 +41,22 @@ class Project(ProjectBase):
     class Config:
         from_attributes = True
 
+# Stakeholder Schemas
+class StakeholderBase(BaseModel):
+    name: str
+    role: Optional[str] = None
+    influence_score: Optional[float] = 1.0
+    email: Optional[EmailStr] = None
+
+class StakeholderCreate(StakeholderBase):
+    project_id: UUID
+
+class Stakeholder(StakeholderBase):
+    id: UUID
+    project_id: UUID
+    class Config:
+        from_attributes = True
+
 # Requirement Schemas
 class RequirementBase(BaseModel):
     text: str
@@ -57,6 +73,12 @@ class RequirementUpdate(BaseModel):
     priority_score: Optional[float] = None
     status: Optional[str] = None
 
+class RequirementBulkUpdateItem(RequirementUpdate):
+    id: UUID
+
+class RequirementBulkUpdate(BaseModel):
+    updates: List[RequirementBulkUpdateItem] = Field(min_length=1, max_length=1000)
+
 class RequirementRevision(BaseModel):
     id: UUID
     requirement_id: UUID
@@ -77,6 +99,48 @@ class Requirement(RequirementBase):
     class Config:
         from_attributes = True
 
+class RequirementImportRow(BaseModel):
+    """One record of a bulk import (NDJSON object or CSV row)."""
+    text: str = Field(min_length=1)
+    category: Optional[str] = None
+    priority_score: float = 0.0
+    sentiment_score: float = 0.0
+    source_type: Optional[str] = None
+    source_ref: Optional[str] = None
+    status: str = "extracted"
+    stakeholder_name: Optional[str] = None
+
+class BulkImportError(BaseModel):
+    row: int # 1-based record number, not counting a CSV header
+    error: str
+
+class BulkImportResult(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[BulkImportError] # the first MAX_REPORTED_ERRORS failures
+    conflicts_detected: Optional[int] = None
+
+class RequirementListItem(BaseModel):
+    """Listing row; under a field projection only the requested fields are set."""
+    id: UUID
+    project_id: Optional[UUID] = None
+    stakeholder_id: Optional[UUID] = None
+    text: Optional[str] = None
+    source_type: Optional[str] = None
+    source_ref: Optional[str] = None
+    category: Optional[str] = None
+    priority_score: Optional[float] = None
+    sentiment_score: Optional[float] = None
+    status: Optional[str] = None
+    created_at: datetime
+    stakeholder: Optional[Stakeholder] = None
+    class Config:
+        from_attributes = True
+
+class RequirementPage(BaseModel):
+    items: List[RequirementListItem]
+    next_cursor: Optional[str] = None
+
 # Conflict Schemas
 class ConflictBase(BaseModel):
     req_a_id: UUID
@@ -98,18 +162,23 @@ class Conflict(ConflictBase):
     class Config:
         from_attributes = True
 
-# Stakeholder Schemas
-class StakeholderBase(BaseModel):
-    name: str
-    role: Optional[str] = None
-    influence_score: Optional[float] = 1.0
-    email: Optional[EmailStr] = None
-
-class StakeholderCreate(StakeholderBase):
-    project_id: UUID
-
-class Stakeholder(StakeholderBase):
+class ConflictListItem(BaseModel):
+    """Listing row; under a field projection only the requested fields are set."""
     id: UUID
-    project_id: UUID
+    project_id: Optional[UUID] = None
+    req_a_id: Optional[UUID] = None
+    req_b_id: Optional[UUID] = None
+    conflict_type: Optional[str] = None
+    severity_score: Optional[float] = Field(None, alias="severity")
+    resolution_summary: Optional[str] = Field(None, alias="suggestion")
+    is_resolved: Optional[bool] = None
+    created_at: datetime
+    req_a: Optional[RequirementListItem] = None
+    req_b: Optional[RequirementListItem] = None
     class Config:
         from_attributes = True
+        populate_by_name = True
+
+class ConflictPage(BaseModel):
+    items: List[ConflictListItem]
+    next_cursor: Optional[str] = None
@@ -2,6 +2,8 @@ from typing import List, Dict, Any
 from sqlalchemy.orm import Session
 from app.models import models
 from app.services.intelligence import IntelligenceService
+from app.services.embeddings import RequirementIndexService
+from uuid import UUID
 
 class AdvisorService:
     @staticmethod
@@ -40,12 +42,21 @@ class AdvisorService:
         if not req:
             return {"error": "Requirement not found"}
             
-        # 1. Identify direct descendants (simplified for now - based on tags or category)
-        dependents = db.query(models.Requirement).filter(
+        # 1. Identify direct descendants: nearest neighbours by text in the same category
+        same_category = [str(rid) for (rid,) in db.query(models.Requirement.id).filter(
             models.Requirement.project_id == req.project_id,
             models.Requirement.category == req.category,
             models.Requirement.id != req.id
-        ).limit(3).all()
+        ).all()]
+        neighbour_ids = [
+            UUID(rid) for rid, _ in RequirementIndexService.nearest(req.project_id, req.text, db, k=3, among=same_category)
+        ]
+        dependents = []
+        if neighbour_ids:
+            by_id = {r.id: r for r in db.query(models.Requirement).filter(
+                models.Requirement.id.in_(neighbour_ids)
+            ).all()}
+            dependents = [by_id[rid] for rid in neighbour_ids if rid in by_id]
         
         # 2. Estimate Risk Increase
         risk_increase = 0.0
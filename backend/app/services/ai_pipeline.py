@@ -1,6 +1,10 @@
 import os
+import re
+import asyncio
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
+from app.core.config import settings
+from app.services.llm_cache import LLMCache, llm_cache
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 
@@ -22,20 +26,77 @@ class ConflictModel(BaseModel):
 class ConflictList(BaseModel):
     conflicts: List[ConflictModel]
 
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token for English prose).
+    """
+    return len(text) // 4 + 1
+
+def chunk_texts(texts: List[str], max_tokens: int, overlap_tokens: int = 0) -> List[str]:
+    """
+    Pack messages into windows of at most `max_tokens`, splitting only on
+    message boundaries. The trailing messages of each window (up to
+    `overlap_tokens`) are repeated at the start of the next one so that
+    requirements spanning a boundary keep their context. A single message
+    larger than the budget is hard-split into budget-sized pieces.
+    """
+    max_chars = max_tokens * 4
+    pieces = []
+    for text in texts:
+        if estimate_tokens(text) > max_tokens:
+            pieces.extend(text[i:i + max_chars] for i in range(0, len(text), max_chars))
+        elif text:
+            pieces.append(text)
+
+    windows = []
+    current: List[str] = []
+    current_tokens = 0
+    for piece in pieces:
+        cost = estimate_tokens(piece)
+        if current and current_tokens + cost > max_tokens:
+            windows.append("\n".join(current))
+            # Carry the tail of the window over, newest message last
+            carried: List[str] = []
+            carried_tokens = 0
+            for prev in reversed(current):
+                prev_cost = estimate_tokens(prev)
+                if carried_tokens + prev_cost > overlap_tokens or carried_tokens + prev_cost + cost > max_tokens:
+                    break
+                carried.insert(0, prev)
+                carried_tokens += prev_cost
+            current, current_tokens = carried, carried_tokens
+        current.append(piece)
+        current_tokens += cost
+    if current:
+        windows.append("\n".join(current))
+    return windows
+
+def _requirement_key(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
 class AIPipeline:
+    MODEL_NAME = "gemini-2.0-flash"
+    TEMPERATURE = 0.1
+    EXTRACTION_TEMPLATE = "Extract all requirements from the following business communication: \n\n{text}"
+    CONFLICT_TEMPLATE = "Identify semantic or logical conflicts in these requirements: \n\n{reqs}"
+
     def __init__(self):
         self.api_key = os.getenv("GOOGLE_API_KEY")
+        self.cache = llm_cache if settings.LLM_CACHE_ENABLED else None
         if self.api_key:
             # Using stable alias with a 30s timeout to prevent hangs
             self.model = ChatGoogleGenerativeAI(
-                model="gemini-2.0-flash", 
+                model=self.MODEL_NAME, 
                 google_api_key=self.api_key,
-                temperature=0.1,
+                temperature=self.TEMPERATURE,
                 request_timeout=30 # Prevent long hangs
             )
         else:
             self.model = None
 
+    def _cache_key(self, template: str, text: str) -> str:
+        return LLMCache.make_key(self.MODEL_NAME, template, text, self.TEMPERATURE)
+
     async def extract_requirements(self, text: str) -> List[Dict[str, Any]]:
         """
         Extract structured requirements from text using Pydantic structured output.
@@ -43,21 +104,64 @@ class AIPipeline:
         if not self.model:
             return [{"text": f"Mock: {text[:20]}", "category": "functional", "priority_score": 5, "sentiment_score": 0, "stakeholder_name": "Mock User"}]
 
+        key = self._cache_key(self.EXTRACTION_TEMPLATE, text)
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
         # Wrap in container class for stable Gemini extraction
         structured_llm = self.model.with_structured_output(RequirementList)
-        prompt = ChatPromptTemplate.from_template(
-            "Extract all requirements from the following business communication: \n\n{text}"
-        )
+        prompt = ChatPromptTemplate.from_template(self.EXTRACTION_TEMPLATE)
         
         try:
             chain = prompt | structured_llm
             result = await chain.ainvoke({"text": text})
             # result is a RequirementList instance
-            return [req.dict() for req in result.requirements]
+            extracted = [req.dict() for req in result.requirements]
+            if self.cache:
+                self.cache.set(key, extracted)
+            return extracted
         except Exception as e:
             print(f"Gemini Extraction failed: {e}")
             return []
 
+    async def extract_requirements_chunked(
+        self,
+        texts: List[str],
+        max_tokens: Optional[int] = None,
+        overlap_tokens: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract requirements from many messages: split them into token-budgeted
+        windows, extract the windows concurrently under a bounded semaphore and
+        merge the results, dropping duplicates (e.g. from window overlap).
+        """
+        windows = chunk_texts(
+            texts,
+            max_tokens or settings.EXTRACTION_CHUNK_TOKENS,
+            settings.EXTRACTION_CHUNK_OVERLAP if overlap_tokens is None else overlap_tokens
+        )
+        semaphore = asyncio.Semaphore(concurrency or settings.EXTRACTION_CONCURRENCY)
+
+        async def run(window: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.extract_requirements(window)
+
+        results = await asyncio.gather(*(run(w) for w in windows))
+
+        merged = []
+        seen = set()
+        for extracted in results:
+            for req in extracted:
+                key = _requirement_key(req.get("text", ""))
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                merged.append(req)
+        return merged
+
     async def detect_conflicts(self, requirements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Detect logical contradictions using Gemini.
@@ -65,16 +169,23 @@ class AIPipeline:
         if not self.model or not requirements:
             return []
 
+        req_str = "\n".join([f"- {r['text']}" for r in requirements])
+        key = self._cache_key(self.CONFLICT_TEMPLATE, req_str)
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
         structured_llm = self.model.with_structured_output(ConflictList)
-        prompt = ChatPromptTemplate.from_template(
-            "Identify semantic or logical conflicts in these requirements: \n\n{reqs}"
-        )
+        prompt = ChatPromptTemplate.from_template(self.CONFLICT_TEMPLATE)
         
         try:
-            req_str = "\n".join([f"- {r['text']}" for r in requirements])
             chain = prompt | structured_llm
             result = await chain.ainvoke({"reqs": req_str})
-            return [c.dict() for c in result.conflicts]
+            conflicts = [c.dict() for c in result.conflicts]
+            if self.cache:
+                self.cache.set(key, conflicts)
+            return conflicts
         except Exception as e:
             print(f"Gemini Conflict Detection failed: {e}")
             return []
@@ -0,0 +1,227 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.models import models
+from app.schemas import schemas
+from app.services.embeddings import RequirementIndexService
+from app.services.ingestion import IngestionService
+from app.services.intelligence import IntelligenceService
+from app.services.metrics import ProjectMetricsService
+from app.services.sentiment_rollup import SentimentRollupService
+
+FORMATS = ("ndjson", "csv")
+
+# Valid rows written per insert; parsed rows beyond this are never held in memory
+BATCH_SIZE = 2000
+
+# Failures past this many are counted but not itemised in the response
+MAX_REPORTED_ERRORS = 1000
+
+COPY_COLUMNS = [
+    "id", "project_id", "stakeholder_id", "text", "source_type", "source_ref",
+    "category", "priority_score", "sentiment_score", "status", "created_at"
+]
+
+
+def guess_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+def _records(stream: IO[bytes], format: str) -> Iterator[Tuple[int, Any]]:
+    """
+    (row number, record dict) per record, read incrementally from `stream`;
+    (row number, error message) for a record that cannot be parsed at all.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if format == "csv":
+        for number, row in enumerate(csv.DictReader(text), start=1):
+            # Empty cells fall back to the schema defaults; surplus cells (key None) are dropped
+            yield number, {key: value for key, value in row.items() if key is not None and value not in ("", None)}
+        return
+
+    number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield number, f"invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield number, "expected a JSON object"
+            continue
+        yield number, record
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+class BulkImportService:
+    """
+    Bulk requirement import from an NDJSON or CSV upload.
+
+    Records are parsed and validated one at a time as the file is read.
+    Valid rows go to the database in BATCH_SIZE batches: COPY on PostgreSQL
+    (psycopg2), an executemany INSERT elsewhere. Invalid rows are skipped and
+    reported by row number. Stakeholders, sentiment pulses, the sentiment
+    rollup and project metrics are maintained per batch, as for a channel
+    ingest. Everything commits in one transaction at the end, with every
+    imported requirement stamped at that point (see _stamp).
+    """
+
+    @staticmethod
+    def import_requirements(
+        project_id: UUID,
+        stream: IO[bytes],
+        format: str,
+        db: Session,
+        detect_conflicts: bool = False
+    ) -> Dict[str, Any]:
+        imported_ids: List[UUID] = []
+        failed = 0
+        errors: List[Dict[str, Any]] = []
+        batch: List[schemas.RequirementImportRow] = []
+        stakeholder_ids: Dict[str, UUID] = {}
+
+        for number, record in _records(stream, format):
+            if isinstance(record, dict):
+                try:
+                    batch.append(schemas.RequirementImportRow.model_validate(record))
+                except ValidationError as exc:
+                    record = _describe(exc)
+            if isinstance(record, str):
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"row": number, "error": record})
+            if len(batch) >= BATCH_SIZE:
+                imported_ids.extend(BulkImportService._write_batch(project_id, batch, stakeholder_ids, db))
+                batch = []
+        if batch:
+            imported_ids.extend(BulkImportService._write_batch(project_id, batch, stakeholder_ids, db))
+        BulkImportService._stamp(imported_ids, db)
+        db.commit()
+        inserted = len(imported_ids)
+        if inserted:
+            RequirementIndexService.schedule_sync(project_id, db.get_bind())
+
+        conflicts_detected = None
+        if detect_conflicts:
+            # One incremental pass; the rows were stamped just before the commit
+            conflicts_detected = len(IntelligenceService.detect_conflicts(project_id, db)) if inserted else 0
+        return {"inserted": inserted, "failed": failed, "errors": errors, "conflicts_detected": conflicts_detected}
+
+    @staticmethod
+    def _write_batch(
+        project_id: UUID,
+        batch: List[schemas.RequirementImportRow],
+        stakeholder_ids: Dict[str, UUID],
+        db: Session
+    ) -> List[UUID]:
+        # Stakeholder ids are cached across batches; only unseen names hit the database
+        names = {row.stakeholder_name.strip() for row in batch if row.stakeholder_name and row.stakeholder_name.strip()}
+        stakeholder_ids.update(IngestionService.resolve_stakeholders(project_id, names - stakeholder_ids.keys(), db))
+
+        # Requirements are restamped at commit time by _stamp
+        imported_at = datetime.utcnow()
+        requirement_rows = []
+        pulse_rows = []
+        for row in batch:
+            stakeholder_id = stakeholder_ids.get((row.stakeholder_name or "").strip())
+            source_type = row.source_type or "import"
+            requirement_rows.append({
+                "id": uuid4(),
+                "project_id": project_id,
+                "stakeholder_id": stakeholder_id,
+                "text": row.text,
+                "source_type": source_type,
+                "source_ref": row.source_ref,
+                "category": row.category,
+                "priority_score": row.priority_score,
+                "sentiment_score": row.sentiment_score,
+                "status": row.status,
+                "created_at": imported_at
+            })
+            if stakeholder_id is not None:
+                pulse_rows.append({
+                    "project_id": project_id,
+                    "stakeholder_id": stakeholder_id,
+                    "score": row.sentiment_score,
+                    "comment_snippet": row.text[:100],
+                    "source_type": source_type,
+                    "created_at": imported_at
+                })
+
+        if not BulkImportService._copy_requirements(db, requirement_rows):
+            db.execute(insert(models.Requirement).execution_options(render_nulls=True), requirement_rows)
+        if pulse_rows:
+            db.execute(insert(models.SentimentPulse), pulse_rows)
+            SentimentRollupService.record(db, pulse_rows)
+        # Core inserts skip the ORM flush hook, so update the rollup here
+        ProjectMetricsService.add_requirements(db, project_id, [row["sentiment_score"] for row in requirement_rows])
+        return [row["id"] for row in requirement_rows]
+
+    @staticmethod
+    def _stamp(requirement_ids: List[UUID], db: Session) -> None:
+        """
+        Give every imported requirement the same created_at, just before the
+        commit. Delta conflict scans only reach CONFLICT_WATERMARK_LAG_SECONDS
+        behind the watermark, and a scan that ran while the import was open
+        may have moved it past early batches stamped when they were written.
+        """
+        stamped_at = datetime.utcnow()
+        for start in range(0, len(requirement_ids), BATCH_SIZE):
+            db.execute(
+                update(models.Requirement)
+                .where(models.Requirement.id.in_(requirement_ids[start:start + BATCH_SIZE]))
+                .values(created_at=stamped_at)
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def _copy_requirements(db: Session, rows: List[Dict[str, Any]]) -> bool:
+        """
+        COPY the rows in through the session's own connection (so inside its
+        transaction). Returns False when the driver has no COPY support
+        (anything but psycopg2 on PostgreSQL), leaving the insert to the caller.
+        """
+        if db.get_bind().dialect.name != "postgresql":
+            return False
+        cursor = db.connection().connection.dbapi_connection.cursor()
+        try:
+            if not hasattr(cursor, "copy_expert"):
+                return False
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                # Unquoted empty fields are NULL in COPY's CSV format
+                writer.writerow([
+                    "" if row[column] is None else
+                    row[column].isoformat() if isinstance(row[column], datetime) else row[column]
+                    for column in COPY_COLUMNS
+                ])
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY {models.Requirement.__tablename__} ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+            return True
+        finally:
+            cursor.close()
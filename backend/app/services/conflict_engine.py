@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from collections import defaultdict
+from bisect import bisect_right
+
+
+@dataclass(frozen=True)
+class ConflictRule:
+    """
+    A keyword rule: fires when `term_a` occurs in the earlier requirement and
+    `term_b` in the later one, both in the same (non-null) category.
+    """
+    term_a: str
+    term_b: str
+    conflict_type: str
+    severity: float
+
+
+# Evaluated in order; the first rule that matches a pair wins.
+DEFAULT_RULES: Tuple[ConflictRule, ...] = (
+    ConflictRule("month", "month", "timeline", 0.85),
+    ConflictRule("all", "except", "scope", 0.7),
+)
+
+
+class ConflictEngine:
+    """
+    Indexed candidate generation for heuristic conflict detection.
+
+    Requirements are grouped by category and an inverted index of rule terms
+    is built once per run, so only pairs that share a rule bucket are
+    evaluated instead of every pair in the project.
+    """
+
+    def __init__(self, rules: Sequence[ConflictRule] = DEFAULT_RULES):
+        self.rules = tuple(rules)
+        self.terms = sorted({t for rule in self.rules for t in (rule.term_a, rule.term_b)})
+
+    def build_index(self, requirements: Sequence[Any]) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Map category -> term -> positions (ascending) of requirements whose
+        lowercased text contains the term. Matching is substring-based, like
+        the original heuristic.
+        """
+        index: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        for pos, req in enumerate(requirements):
+            if req.category is None:
+                continue
+            low = (req.text or "").lower()
+            buckets = index[req.category]
+            for term in self.terms:
+                if term in low:
+                    buckets[term].append(pos)
+        return index
+
+    def find_conflicts(
+        self,
+        requirements: Sequence[Any],
+        new_positions: Optional[Set[int]] = None
+    ) -> List[Tuple[Any, Any, ConflictRule]]:
+        """
+        Return (req_a, req_b, rule) for every conflicting pair, in the same
+        order a full pairwise scan over `requirements` would produce them.
+        When `new_positions` is given, only pairs touching at least one of
+        those positions are scored (delta mode: new x all).
+        """
+        matches: Dict[Tuple[int, int], ConflictRule] = {}
+        for buckets in self.build_index(requirements).values():
+            for rule in self.rules:
+                left = buckets.get(rule.term_a)
+                right = buckets.get(rule.term_b)
+                if not left or not right:
+                    continue
+                if new_positions is None:
+                    pairs = self._bucket_pairs(left, right)
+                else:
+                    pairs = self._delta_pairs(left, right, new_positions)
+                for i, j in pairs:
+                    matches.setdefault((i, j), rule)
+
+        return [
+            (requirements[i], requirements[j], matches[(i, j)])
+            for i, j in sorted(matches)
+        ]
+
+    @staticmethod
+    def _bucket_pairs(left: List[int], right: List[int]) -> Iterable[Tuple[int, int]]:
+        """
+        Yield (i, j) with i from `left`, j from `right` and i < j. Both lists
+        are sorted, so each i only walks the tail of `right` past it.
+        """
+        for i in left:
+            for j in right[bisect_right(right, i):]:
+                yield i, j
+
+    @staticmethod
+    def _delta_pairs(left: List[int], right: List[int], new_positions: Set[int]) -> Iterable[Tuple[int, int]]:
+        """
+        Like `_bucket_pairs`, but skips pairs where both sides were already
+        scanned. Old members of `left` only walk the new members of `right`.
+        """
+        right_new = [j for j in right if j in new_positions]
+        for i in left:
+            tail = right if i in new_positions else right_new
+            for j in tail[bisect_right(tail, i):]:
+                yield i, j
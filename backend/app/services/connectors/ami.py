@@ -1,7 +1,8 @@
 from .base import BaseConnector
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
 from app.utils.dataset_fetcher import DatasetFetcher
 from app.utils.noise_filter import NoiseFilter
+from app.utils.batch_parser import parse_in_batches
 
 class AMIConnector(BaseConnector):
     def __init__(self, mode: str = "sample"):
@@ -18,13 +19,43 @@ class AMIConnector(BaseConnector):
         Parses transcripts into a format suitable for requirement extraction.
         Filters out fluff and small talk using NoiseFilter.
         """
-        parsed_transcripts = []
+        return AMIConnector.parse_batch(raw_data)
+
+    async def parse_stream(self, raw_data: List[Dict[str, Any]]) -> AsyncIterator[str]:
+        """
+        Parse many meetings on the shared process pool, in input order.
+        """
+        async for text in parse_in_batches(raw_data, AMIConnector.parse_batch):
+            yield text
+
+    async def parse_record_stream(self, raw_data: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Like parse_stream, but yields each transcript with its meeting metadata.
+        """
+        async for record in parse_in_batches(raw_data, AMIConnector.parse_records):
+            yield record
+
+    @staticmethod
+    def parse_batch(raw_data: List[Dict[str, Any]]) -> List[str]:
+        """
+        Picklable per-chunk worker for parse_data / parse_stream.
+        """
+        return [record["text"] for record in AMIConnector.parse_records(raw_data)]
+
+    @staticmethod
+    def parse_records(raw_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Filtered transcripts as {text, meeting_id, recipients, date} records;
+        recipients are the meeting's speakers.
+        """
+        records = []
         for meeting in raw_data:
             summary = meeting.get("summary", "")
             content = f"Meeting ID: {meeting.get('meeting_id')}\n"
             content += f"Summary: {NoiseFilter.clean_text(summary)}\n"
             content += "Transcript:\n"
             
+            speakers = []
             for entry in meeting.get("transcript", []):
                 speaker = entry['speaker']
                 text = entry['text']
@@ -33,7 +64,14 @@ class AMIConnector(BaseConnector):
                 if not NoiseFilter.is_noise(text):
                     clean_text = NoiseFilter.clean_text(text)
                     content += f"[{speaker}]: {clean_text}\n"
+                if speaker not in speakers:
+                    speakers.append(speaker)
                     
-            parsed_transcripts.append(content)
+            records.append({
+                "text": content,
+                "meeting_id": meeting.get("meeting_id"),
+                "recipients": speakers,
+                "date": meeting.get("date")
+            })
             
-        return parsed_transcripts
+        return records
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
 
 class BaseConnector(ABC):
     @abstractmethod
@@ -15,3 +15,11 @@ class BaseConnector(ABC):
         Convert raw platform data into plain text for processing.
         """
         pass
+
+    async def parse_stream(self, raw_data: List[Dict[str, Any]]) -> AsyncIterator[str]:
+        """
+        Stream parsed texts. Parses inline by default; connectors with
+        CPU-heavy parsing override this to fan out to a process pool.
+        """
+        for text in self.parse_data(raw_data):
+            yield text
@@ -1,27 +1,69 @@
 from .base import BaseConnector
-from typing import List, Dict, Any
-from app.utils.dataset_fetcher import DatasetFetcher
+from typing import List, Dict, Any, AsyncIterator, Iterable, Union
+from app.core.config import settings
+from app.utils.dataset_fetcher import DatasetFetcher, EmailStream
 from app.utils.noise_filter import NoiseFilter
+from app.utils.batch_parser import parse_in_batches
 import os
 
 class EnronConnector(BaseConnector):
     def __init__(self, mode: str = "sample"):
         self.mode = mode
 
-    async def fetch_data(self, **kwargs) -> List[Dict[str, Any]]:
+    async def fetch_data(self, **kwargs) -> Union[List[Dict[str, Any]], EmailStream]:
         """
         Fetches emails from the Enron dataset.
+        "sample" mode returns a list (local corpus if configured, else the curated
+        sample); "full" mode returns a lazy EmailStream over the local corpus.
         """
         limit = kwargs.get("limit", 100)
-        # In this implementation, we use the sample fetcher
-        return await DatasetFetcher.fetch_enron_samples(limit=limit)
+        offset = kwargs.get("offset", 0)
+        sample_rate = kwargs.get("sample_rate", 1.0)
+        path = kwargs.get("path") or settings.ENRON_DATASET_PATH
+
+        if self.mode == "full" and path:
+            return EmailStream(path, limit=limit, offset=offset, sample_rate=sample_rate)
+        return await DatasetFetcher.fetch_enron_samples(
+            limit=limit or 100, offset=offset, sample_rate=sample_rate, path=path
+        )
 
     def parse_data(self, raw_data: List[Dict[str, Any]]) -> List[str]:
         """
         Extracts relevant project signals from emails using advanced filtering.
         """
-        parsed_texts = []
+        return EnronConnector.parse_batch(raw_data)
+
+    async def parse_stream(self, raw_data: Iterable[Union[str, Dict[str, Any]]]) -> AsyncIterator[str]:
+        """
+        Parse large mail corpora on the shared process pool, in input order.
+        """
+        async for text in parse_in_batches(raw_data, EnronConnector.parse_batch):
+            yield text
+
+    async def parse_record_stream(self, raw_data: Iterable[Union[str, Dict[str, Any]]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Like parse_stream, but yields each text with its email metadata.
+        """
+        async for record in parse_in_batches(raw_data, EnronConnector.parse_records):
+            yield record
+
+    @staticmethod
+    def parse_batch(raw_data: List[Union[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Picklable per-chunk worker for parse_data / parse_stream.
+        """
+        return [record["text"] for record in EnronConnector.parse_records(raw_data)]
+
+    @staticmethod
+    def parse_records(raw_data: List[Union[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Noise-filtered emails as {text, sender, recipients, date} records.
+        Raw RFC 822 strings (from an EmailStream) are MIME-parsed here, in the worker.
+        """
+        records = []
         for email in raw_data:
+            if isinstance(email, str):
+                email = DatasetFetcher.parse_raw_email(email)
             body = email.get("body", "")
             subject = email.get("subject", "")
             
@@ -32,6 +74,11 @@ class EnronConnector(BaseConnector):
                 continue
                 
             clean_body = NoiseFilter.clean_text(body)
-            parsed_texts.append(f"Subject: {subject}\nFrom: {email.get('sender')}\nContent: {clean_body}")
+            records.append({
+                "text": f"Subject: {subject}\nFrom: {email.get('sender')}\nContent: {clean_body}",
+                "sender": email.get("sender"),
+                "recipients": list(email.get("recipients") or []),
+                "date": email.get("date")
+            })
             
-        return parsed_texts
+        return records
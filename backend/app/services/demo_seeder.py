@@ -5,24 +5,32 @@ from typing import List, Dict, Any
 from uuid import UUID
 from sqlalchemy.orm import Session
 
+from app.db.session import AnySession, run_sync
 from app.models import models
 from app.services.ai_pipeline import ai_processor
+from app.services.embeddings import RequirementIndexService
+from app.services.intelligence import IntelligenceService
 
 class DemoSeederService:
     """
     Orchestrates full system seeding for demo projects.
     """
+    # Only this many parsed texts are sent for extraction
+    MAX_SOURCE_TEXTS = 5
 
     @staticmethod
-    async def seed_full_demo(project_id: UUID, dataset_type: str, raw_texts: List[str], db: Session):
+    async def seed_full_demo(project_id: UUID, dataset_type: str, raw_texts: List[str], db: AnySession):
         """
         Populates requirements, conflicts, sentiment, and timeline events.
+        Database work goes through run_sync, so with an AsyncSession the
+        queries and commits are awaited; the Python around them (including
+        conflict detection) still runs on the loop thread.
         """
         print(f"🌱 Starting full demo seeding for project {project_id} using {dataset_type}...")
         
         # 1. Process Requirements (Level 1) - Parallelized for speed
         db_reqs = []
-        chunks_to_process = raw_texts[:5] # Reduced for reliable performance
+        chunks_to_process = raw_texts[:DemoSeederService.MAX_SOURCE_TEXTS] # Reduced for reliable performance
         
         print(f"📝 Extracting requirements from {len(chunks_to_process)} chunks...")
         tasks = [ai_processor.extract_requirements(chunk) for chunk in chunks_to_process]
@@ -48,25 +56,31 @@ class DemoSeederService:
                     db.add(db_req)
                     db_reqs.append(db_req)
         
-        db.commit()
+        await run_sync(db, Session.commit)
         print(f"✅ Extracted {len(db_reqs)} requirements.")
 
+        # Heuristic pass over the freshly written requirements
+        rule_conflicts = await run_sync(db, lambda session: IntelligenceService.detect_conflicts(project_id, session))
+
+        # Read what the next steps need while still inside the session
+        req_snapshot = await run_sync(db, lambda session: [(r.id, r.text) for r in db_reqs])
+
         # 2. Simulate Timeline Evolution (Level 2)
-        if db_reqs:
-            base_req = db_reqs[0]
+        if req_snapshot:
+            base_req_id, base_req_text = req_snapshot[0]
             for i in range(2):
                 revision = models.RequirementRevision(
-                    requirement_id=base_req.id,
-                    old_text=base_req.text if i == 0 else f"Revision {i} text",
-                    new_text=f"Refined {dataset_type.upper()} requirement v{i+1}",
-                    reason="Neural refinement based on context",
+                    requirement_id=base_req_id,
+                    field_changed="text",
+                    old_value=base_req_text if i == 0 else f"Revision {i} text",
+                    new_value=f"Refined {dataset_type.upper()} requirement v{i+1}",
                     created_at=datetime.utcnow() - timedelta(days=random.randint(1, 5))
                 )
                 db.add(revision)
 
         # 3. Detect Conflicts (Level 3)
         print("⚔️ Detecting conflicts...")
-        conflicts = await ai_processor.detect_conflicts([{"text": r.text} for r in db_reqs])
+        conflicts = await ai_processor.detect_conflicts([{"text": text} for _, text in req_snapshot])
         for conf_data in conflicts:
             db_conf = models.Conflict(
                 project_id=project_id,
@@ -78,6 +92,8 @@ class DemoSeederService:
             )
             db.add(db_conf)
 
-        db.commit()
-        print(f"🏁 Seeding complete: {len(db_reqs)} Reqs, {len(conflicts)} Conflicts.")
-        return {"requirements": len(db_reqs), "conflicts": len(conflicts)}
+        await run_sync(db, Session.commit)
+        await run_sync(db, lambda session: RequirementIndexService.schedule_sync(project_id, session.get_bind()))
+        total_conflicts = len(conflicts) + len(rule_conflicts)
+        print(f"🏁 Seeding complete: {len(db_reqs)} Reqs, {total_conflicts} Conflicts.")
+        return {"requirements": len(db_reqs), "conflicts": total_conflicts}
@@ -0,0 +1,500 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from uuid import UUID, uuid4
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import models
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock still serialises writers
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Score-matrix cells held at once by a search. Each cell costs a float32 score
+# plus an int64 argpartition index, so 4M cells keep a block near 48 MB at
+# any project size; queries are scored in row blocks sized from the index
+SEARCH_BLOCK_CELLS = 1 << 22
+
+
+def _block_rows(n: int) -> int:
+    """Query rows per block when scoring against an index of `n` vectors."""
+    return max(1, SEARCH_BLOCK_CELLS // max(n, 1))
+
+
+class BaseEmbedder(ABC):
+    """
+    Turns requirement text into L2-normalised float32 vectors.
+    """
+    name: str = "base"
+    dim: int
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Return an (n, dim) float32 matrix with unit-length rows.
+        """
+        pass
+
+
+class HashingEmbedder(BaseEmbedder):
+    """
+    Deterministic feature-hashing embedder (unigrams + bigrams).
+    Needs no model or network access, so it is the offline default.
+    """
+    name = "hashing"
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        # blake2b rather than hash(): stable across processes and restarts
+        digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        return digest % self.dim, 1.0 if (digest >> 63) & 1 else -1.0
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = TOKEN_RE.findall((text or "").lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                col, sign = self._bucket(feature)
+                matrix[row, col] += sign
+        return _normalize(matrix)
+
+
+class GeminiEmbedder(BaseEmbedder):
+    """
+    Gemini text embeddings via LangChain. Requires GOOGLE_API_KEY.
+    """
+    name = "gemini"
+
+    def __init__(self, model: str = "models/text-embedding-004"):
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        self.client = GoogleGenerativeAIEmbeddings(model=model, google_api_key=os.getenv("GOOGLE_API_KEY"))
+        self.dim = len(self.client.embed_query("dimension probe"))
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return _normalize(np.asarray(self.client.embed_documents(list(texts)), dtype=np.float32))
+
+
+class VectorIndex(ABC):
+    """
+    Pluggable nearest-neighbour store for requirement vectors.
+    """
+
+    @abstractmethod
+    def upsert(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        pass
+
+    @abstractmethod
+    def remove(self, ids: Sequence[str]) -> None:
+        pass
+
+    @abstractmethod
+    def search(self, queries: np.ndarray, k: int = 5) -> List[List[Tuple[str, float]]]:
+        """
+        Top-k (id, cosine score) per query row, best first.
+        """
+        pass
+
+    @abstractmethod
+    def ids(self) -> List[str]:
+        pass
+
+    def save(self) -> None:
+        pass
+
+
+_thread_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+_thread_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _index_lock(path: str) -> Iterator[None]:
+    """Exclusive per-index write lock: a thread lock plus flock across processes."""
+    with _thread_locks_guard:
+        thread_lock = _thread_locks[path]
+    with thread_lock, open(path, "a") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class LocalVectorIndex(VectorIndex):
+    """
+    In-process index: a float32 matrix searched with a single matmul.
+    Persisted as a raw memory-mapped data file plus an id manifest
+    (`<name>.json`) naming it, so reopening a project index does not re-read
+    it eagerly.
+
+    Rows referenced by the saved manifest are never moved in place: new ids
+    are appended past them, and remove() compacts into a new data file
+    (copy-on-write). save() publishes the manifest with os.replace, so a
+    reader or a crash only ever sees a matching (manifest, data file) pair.
+    Writers go through edit(), which serialises them per index.
+    """
+
+    def __init__(self, directory: str, name: str, dim: int, embedder_name: str = "hashing"):
+        self.dim = dim
+        self.embedder_name = embedder_name
+        self.directory = directory
+        self.name = name
+        self.manifest_path = os.path.join(directory, f"{name}.json")
+        self.lock_path = os.path.join(directory, f"{name}.lock")
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._matrix: Optional[np.memmap] = None
+        self.matrix_path = os.path.join(self.directory, f"{self.name}.{uuid4().hex}.f32")
+        # The data file can be replaced between reading the manifest and opening it: retry
+        for _ in range(3):
+            try:
+                with open(self.manifest_path) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                return
+            # A different embedder or dimension makes the stored vectors meaningless
+            if manifest.get("dim") != self.dim or manifest.get("embedder") != self.embedder_name:
+                return
+            matrix_path = os.path.join(self.directory, manifest.get("file", f"{self.name}.f32"))
+            try:
+                capacity = os.path.getsize(matrix_path) // (self.dim * 4)
+                matrix = np.memmap(matrix_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim)) if capacity else None
+            except (OSError, ValueError):
+                continue
+            if len(manifest["ids"]) > capacity:
+                return
+            self.matrix_path = matrix_path
+            self._matrix = matrix
+            self._ids = manifest["ids"]
+            self._positions = {rid: pos for pos, rid in enumerate(self._ids)}
+            return
+
+    @contextmanager
+    def edit(self) -> Iterator["LocalVectorIndex"]:
+        """
+        Hold the index's write lock, reload the latest saved state and save
+        on a clean exit, so concurrent writers never lose each other's changes.
+        """
+        with _index_lock(self.lock_path):
+            self._load()
+            yield self
+            self.save()
+
+    def _ensure_capacity(self, rows: int):
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2, 1024)
+        # Growing only extends the file; rows already there (and maps of them) stay valid
+        with open(self.matrix_path, "ab") as f:
+            f.truncate(new_capacity * self.dim * 4)
+        self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r+", shape=(new_capacity, self.dim))
+
+    def upsert(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        fresh = [rid for rid in dict.fromkeys(ids) if rid not in self._positions]
+        self._ensure_capacity(len(self._ids) + len(fresh))
+        for rid in fresh:
+            self._positions[rid] = len(self._ids)
+            self._ids.append(rid)
+        for rid, vector in zip(ids, vectors):
+            self._matrix[self._positions[rid]] = vector
+
+    def remove(self, ids: Sequence[str]) -> None:
+        gone = {rid for rid in ids if rid in self._positions}
+        if not gone:
+            return
+        keep = [rid for rid in self._ids if rid not in gone]
+        rows = np.asarray(self._matrix[[self._positions[rid] for rid in keep]]) if keep else None
+        # Copy-on-write: the compacted rows go to a new data file, published by save()
+        self._matrix = None
+        self.matrix_path = os.path.join(self.directory, f"{self.name}.{uuid4().hex}.f32")
+        self._ids, self._positions = [], {}
+        if keep:
+            self.upsert(keep, rows)
+
+    def search(self, queries: np.ndarray, k: int = 5) -> List[List[Tuple[str, float]]]:
+        n = len(self._ids)
+        if n == 0 or len(queries) == 0:
+            return [[] for _ in range(len(queries))]
+        k = min(k, n)
+        queries = np.asarray(queries, dtype=np.float32)
+        results = []
+        for start in range(0, len(queries), _block_rows(n)):
+            scores = queries[start:start + _block_rows(n)] @ self._matrix[:n].T
+            # Only the last k columns of the partition are kept (no negated copy)
+            top = np.argpartition(scores, n - k, axis=1)[:, n - k:]
+            for row, cols in enumerate(top):
+                ordered = cols[np.argsort(-scores[row, cols])]
+                results.append([(self._ids[c], float(scores[row, c])) for c in ordered])
+        return results
+
+    def vectors_for(self, ids: Sequence[str]) -> np.ndarray:
+        return np.asarray(self._matrix[[self._positions[rid] for rid in ids]]) if ids else np.zeros((0, self.dim), dtype=np.float32)
+
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    def __contains__(self, rid: str) -> bool:
+        return rid in self._positions
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def save(self) -> None:
+        if self._matrix is not None:
+            self._matrix.flush()
+        elif not os.path.exists(self.matrix_path):
+            open(self.matrix_path, "wb").close()
+        manifest = {
+            "dim": self.dim, "embedder": self.embedder_name,
+            "file": os.path.basename(self.matrix_path), "ids": self._ids
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f"{self.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, self.manifest_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        # Data files no manifest points at any more (open maps of them stay valid)
+        name = glob.escape(self.name)
+        for path in glob.glob(os.path.join(self.directory, f"{name}.*.f32")) + glob.glob(os.path.join(self.directory, f"{name}.f32")):
+            if path != self.matrix_path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+_embedder: Optional[BaseEmbedder] = None
+
+
+def get_embedder() -> BaseEmbedder:
+    global _embedder
+    if _embedder is None:
+        if settings.EMBEDDING_BACKEND == "gemini" and os.getenv("GOOGLE_API_KEY"):
+            _embedder = GeminiEmbedder()
+        else:
+            _embedder = HashingEmbedder(dim=settings.EMBEDDING_DIM)
+    return _embedder
+
+
+_sync_executor: Optional[ThreadPoolExecutor] = None
+_sync_pending: Set[UUID] = set()
+_sync_guard = threading.Lock()
+
+
+def shutdown_index_sync() -> None:
+    global _sync_executor
+    if _sync_executor is not None:
+        _sync_executor.shutdown(cancel_futures=True)
+        _sync_executor = None
+
+
+class RequirementIndexService:
+    """
+    Keeps a per-project vector index of Requirement.text in step with the DB
+    and answers nearest-neighbour queries against it.
+
+    Bulk embedding happens off the request path: writers call schedule_sync()
+    after committing new requirements, and reads use whatever is indexed,
+    scheduling a catch-up sync when the index is behind.
+    """
+
+    @staticmethod
+    def open_index(project_id: UUID) -> LocalVectorIndex:
+        embedder = get_embedder()
+        return LocalVectorIndex(settings.VECTOR_INDEX_DIR, str(project_id), embedder.dim, embedder.name)
+
+    @staticmethod
+    def sync(project_id: UUID, db: Session) -> LocalVectorIndex:
+        """
+        Embed requirements missing from the index and drop deleted ones.
+        Only ids are read for requirements that are already indexed, and the
+        embedding runs before the index's write lock is taken.
+        """
+        index = RequirementIndexService.open_index(project_id)
+        current = {str(rid) for (rid,) in db.query(models.Requirement.id).filter(
+            models.Requirement.project_id == project_id
+        ).all()}
+        indexed = set(index.ids())
+
+        stale = indexed - current
+        missing = [UUID(rid) for rid in current - indexed]
+        embedded: List[Tuple[List[str], np.ndarray]] = []
+        for start in range(0, len(missing), 1000):
+            batch = db.query(models.Requirement.id, models.Requirement.text).filter(
+                models.Requirement.id.in_(missing[start:start + 1000])
+            ).all()
+            embedded.append(([str(r.id) for r in batch], get_embedder().embed([r.text for r in batch])))
+
+        if stale or missing:
+            with index.edit():
+                index.remove(list(stale))
+                for ids, vectors in embedded:
+                    index.upsert(ids, vectors)
+        return index
+
+    @staticmethod
+    def schedule_sync(project_id: UUID, bind: Optional[Engine] = None) -> None:
+        """
+        Sync the project's index on a background thread with its own session
+        (on `bind`, or the app engine). A sync already pending for the project
+        covers this request too.
+        """
+        global _sync_executor
+        if bind is None or bind.dialect.is_async:
+            from app.db.session import engine
+            bind = engine
+        with _sync_guard:
+            if project_id in _sync_pending:
+                return
+            _sync_pending.add(project_id)
+            if _sync_executor is None:
+                _sync_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vector-index")
+            _sync_executor.submit(RequirementIndexService._background_sync, project_id, bind)
+
+    @staticmethod
+    def _background_sync(project_id: UUID, bind: Engine) -> None:
+        with _sync_guard:
+            _sync_pending.discard(project_id)
+        try:
+            with Session(bind=bind) as db:
+                RequirementIndexService.sync(project_id, db)
+        except Exception:
+            logger.exception(f"Vector index sync for project {project_id} failed")
+
+    @staticmethod
+    def current(project_id: UUID, db: Session) -> LocalVectorIndex:
+        """
+        The project's index as it is now, for reads. Nothing is embedded here;
+        if the index is behind the requirements table a background sync is
+        scheduled and the read answers from what is already indexed.
+        """
+        index = RequirementIndexService.open_index(project_id)
+        count = db.query(func.count(models.Requirement.id)).filter(
+            models.Requirement.project_id == project_id
+        ).scalar()
+        if count != len(index):
+            RequirementIndexService.schedule_sync(project_id, db.get_bind())
+        return index
+
+    @staticmethod
+    def reindex_requirement(requirement: models.Requirement) -> None:
+        """
+        Refresh one requirement's vector after its text changed.
+        """
+        RequirementIndexService.reindex_requirements([requirement])
+
+    @staticmethod
+    def reindex_requirements(requirements: Sequence[models.Requirement]) -> None:
+        """
+        Refresh the vectors of edited requirements: one embedding call and one
+        index save per project, however many requirements changed.
+        """
+        by_project: Dict[UUID, List[models.Requirement]] = defaultdict(list)
+        for requirement in requirements:
+            by_project[requirement.project_id].append(requirement)
+        for project_id, changed in by_project.items():
+            vectors = get_embedder().embed([r.text for r in changed])
+            index = RequirementIndexService.open_index(project_id)
+            with index.edit():
+                index.upsert([str(r.id) for r in changed], vectors)
+
+    @staticmethod
+    def invalidate(requirements: Sequence[models.Requirement]) -> None:
+        """
+        Drop the vectors of requirements whose re-embedding failed, so the
+        next sync() sees them as missing and embeds their current text.
+        """
+        by_project: Dict[UUID, List[str]] = defaultdict(list)
+        for requirement in requirements:
+            by_project[requirement.project_id].append(str(requirement.id))
+        for project_id, ids in by_project.items():
+            index = RequirementIndexService.open_index(project_id)
+            with index.edit():
+                index.remove(ids)
+
+    @staticmethod
+    def nearest(
+        project_id: UUID,
+        text: str,
+        db: Session,
+        k: int = 5,
+        among: Optional[Sequence[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k (id, score) for `text`, best first. With `among`, only those
+        requirement ids are ranked (e.g. one category), so a narrow subset is
+        not crowded out by closer matches elsewhere in the project.
+        """
+        index = RequirementIndexService.current(project_id, db)
+        query = get_embedder().embed([text])
+        if among is None:
+            return index.search(query, k)[0]
+        candidates = [rid for rid in dict.fromkeys(among) if rid in index]
+        if not candidates:
+            return []
+        scores = index.vectors_for(candidates) @ query[0]
+        ordered = np.argsort(-scores, kind="stable")[:k]
+        return [(candidates[i], float(scores[i])) for i in ordered]
+
+    @staticmethod
+    def candidate_pairs(project_id: UUID, db: Session, k: int = 5, min_score: float = 0.5) -> List[Tuple[str, str, float]]:
+        """
+        Nearest-neighbour candidate pairs for conflict checks: every requirement
+        against its top-k neighbours, O(n*k) pairs instead of all n^2.
+        Pairs are unordered and deduplicated.
+        """
+        index = RequirementIndexService.current(project_id, db)
+        ids = index.ids()
+        pairs: Dict[frozenset, Tuple[str, str, float]] = {}
+        rows = _block_rows(len(ids))
+        for start in range(0, len(ids), rows):
+            chunk = ids[start:start + rows]
+            # k + 1 because each requirement's nearest neighbour is itself
+            for rid, hits in zip(chunk, index.search(index.vectors_for(chunk), k + 1)):
+                for other, score in hits:
+                    if other == rid or score < min_score:
+                        continue
+                    pairs.setdefault(frozenset((rid, other)), (rid, other, score))
+        return sorted(pairs.values(), key=lambda p: -p[2])
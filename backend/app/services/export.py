@@ -0,0 +1,148 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session, aliased
+
+from app.models import models
+
+ENTITIES = ("requirements", "conflicts", "revisions")
+
+# Rows fetched per server-side cursor round trip, and per chunk written out
+BATCH_SIZE = 1000
+
+# CSV has one header for every record type; each row fills its own columns
+CSV_COLUMNS = [
+    "record_type", "id", "project_id", "created_at",
+    "text", "category", "status", "source_type", "source_ref", "priority_score", "sentiment_score", "stakeholder",
+    "conflict_type", "severity_score", "is_resolved", "resolution_summary",
+    "req_a_id", "req_a_text", "req_b_id", "req_b_text",
+    "requirement_id", "field_changed", "old_value", "new_value", "changed_by"
+]
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class ExportService:
+    """
+    Streams a project's requirements, conflicts (with both requirements'
+    text) and revisions as NDJSON or CSV.
+
+    Every query reads column tuples through a server-side cursor
+    (`yield_per`), and output goes out in BATCH_SIZE-row chunks. Memory
+    therefore stays flat however large the project is, and the first chunk
+    is ready after the first batch rather than after the whole project.
+    """
+
+    @staticmethod
+    def records(project_id: UUID, db: Session, entities: Sequence[str] = ENTITIES) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(record type, row) pairs for the requested entities, one entity after another."""
+        if "requirements" in entities:
+            rows = db.query(
+                models.Requirement.id, models.Requirement.project_id, models.Requirement.created_at,
+                models.Requirement.text, models.Requirement.category, models.Requirement.status,
+                models.Requirement.source_type, models.Requirement.source_ref,
+                models.Requirement.priority_score, models.Requirement.sentiment_score,
+                models.Stakeholder.name.label("stakeholder")
+            ).outerjoin(
+                models.Stakeholder, models.Stakeholder.id == models.Requirement.stakeholder_id
+            ).filter(
+                models.Requirement.project_id == project_id
+            ).order_by(models.Requirement.created_at, models.Requirement.id).yield_per(BATCH_SIZE)
+            for row in rows:
+                yield "requirement", row._asdict()
+
+        if "conflicts" in entities:
+            req_a, req_b = aliased(models.Requirement), aliased(models.Requirement)
+            rows = db.query(
+                models.Conflict.id, models.Conflict.project_id, models.Conflict.created_at,
+                models.Conflict.conflict_type, models.Conflict.severity_score,
+                models.Conflict.is_resolved, models.Conflict.resolution_summary,
+                models.Conflict.req_a_id, req_a.text.label("req_a_text"),
+                models.Conflict.req_b_id, req_b.text.label("req_b_text")
+            ).outerjoin(
+                req_a, req_a.id == models.Conflict.req_a_id
+            ).outerjoin(
+                req_b, req_b.id == models.Conflict.req_b_id
+            ).filter(
+                models.Conflict.project_id == project_id
+            ).order_by(
+                # The order of ix_conflicts_project_resolved_created: streams without a sort
+                models.Conflict.is_resolved, models.Conflict.created_at, models.Conflict.id
+            ).yield_per(BATCH_SIZE)
+            for row in rows:
+                yield "conflict", row._asdict()
+
+        if "revisions" in entities:
+            rows = db.query(
+                models.RequirementRevision.id, models.Requirement.project_id, models.RequirementRevision.created_at,
+                models.RequirementRevision.requirement_id, models.RequirementRevision.field_changed,
+                models.RequirementRevision.old_value, models.RequirementRevision.new_value,
+                models.RequirementRevision.changed_by
+            ).join(
+                models.Requirement, models.Requirement.id == models.RequirementRevision.requirement_id
+            ).filter(
+                models.Requirement.project_id == project_id
+            ).order_by(
+                # Deterministic output; the leading columns match ix_requirement_revisions_requirement_created
+                models.RequirementRevision.requirement_id, models.RequirementRevision.created_at,
+                models.RequirementRevision.id
+            ).yield_per(BATCH_SIZE)
+            for row in rows:
+                yield "revision", row._asdict()
+
+    @staticmethod
+    def stream_ndjson(project: models.Project, db: Session, entities: Sequence[str] = ENTITIES) -> Iterator[bytes]:
+        """
+        One JSON object per line. The first line describes the project and
+        every later line carries a "type" (requirement, conflict, revision).
+        """
+        header = {
+            "type": "project", "id": project.id, "name": project.name,
+            "description": project.description, "status": project.status,
+            "exported_at": datetime.utcnow()
+        }
+        lines = [json.dumps({key: _plain(value) for key, value in header.items()})]
+        for record_type, row in ExportService.records(project.id, db, entities):
+            row = {key: _plain(value) for key, value in row.items()}
+            lines.append(json.dumps({"type": record_type, **row}))
+            if len(lines) >= BATCH_SIZE:
+                yield ("\n".join(lines) + "\n").encode()
+                lines = []
+        if lines:
+            yield ("\n".join(lines) + "\n").encode()
+
+    @staticmethod
+    def stream_csv(project: models.Project, db: Session, entities: Sequence[str] = ENTITIES) -> Iterator[bytes]:
+        """A single CSV; record_type tells requirement, conflict and revision rows apart."""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        pending = 0
+        for record_type, row in ExportService.records(project.id, db, entities):
+            writer.writerow({"record_type": record_type, **{key: _plain(value) for key, value in row.items()}})
+            pending += 1
+            if pending >= BATCH_SIZE:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        yield buffer.getvalue().encode()
+
+
+def parse_entities(value: str) -> List[str]:
+    """`requirements,conflicts` -> ["requirements", "conflicts"]; raises ValueError on unknown names."""
+    requested = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in ENTITIES]
+    if unknown or not requested:
+        raise ValueError(f"entities must be a comma-separated subset of {', '.join(ENTITIES)}")
+    return requested
@@ -1,23 +1,464 @@
-from neo4j import GraphDatabase
-import os
-from dotenv import load_dotenv
+import asyncio
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from app.core.config import settings
 
-load_dotenv()
+T = TypeVar("T")
 
-NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
-NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
 
-class GraphService:
-    def __init__(self):
-        self.driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+class GraphService(ABC):
+    """
+    Stakeholder / meeting graph store.
+
+    Write operations take rows that GraphSeeder has already aggregated;
+    read operations answer the influence, path and neighbourhood questions
+    the advisor and dashboards ask. Stakeholders are addressed by `name`
+    (their email for Enron, their role for AMI), optionally scoped to a
+    project.
+    """
+
+    # Writes
+    @abstractmethod
+    def ensure_indexes(self) -> None:
+        pass
+
+    @abstractmethod
+    def merge_email_stakeholders(self, emails: List[str], batch_size: Optional[int] = None) -> None:
+        pass
+
+    @abstractmethod
+    def merge_communications(self, rows: List[Dict[str, Any]], batch_size: Optional[int] = None) -> None:
+        """
+        rows: {sender, recipient, weight}; weights add to existing edges.
+        """
+        pass
+
+    @abstractmethod
+    def add_influence(self, rows: List[Dict[str, Any]], batch_size: Optional[int] = None) -> None:
+        """
+        rows: {email, score}; scores add to influence_score.
+        """
+        pass
+
+    @abstractmethod
+    def merge_meetings(self, project_id: str, meeting_ids: List[str], batch_size: Optional[int] = None) -> None:
+        pass
+
+    @abstractmethod
+    def merge_role_stakeholders(self, project_id: str, roles: List[str], batch_size: Optional[int] = None) -> None:
+        pass
+
+    @abstractmethod
+    def merge_participation(self, project_id: str, rows: List[Dict[str, Any]], batch_size: Optional[int] = None) -> None:
+        """
+        rows: {role, meeting_id}
+        """
+        pass
+
+    # Reads
+    @abstractmethod
+    def influence(self, limit: int = 10, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Stakeholders ranked by influence_score, then by degree.
+        """
+        pass
+
+    @abstractmethod
+    def shortest_path(self, source: str, target: str, max_depth: int = 6, project_id: Optional[str] = None) -> List[str]:
+        """
+        Names along the shortest undirected path, or [] if unreachable.
+        """
+        pass
+
+    @abstractmethod
+    def neighbourhood(self, name: str, depth: int = 1, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Nodes within `depth` hops as {name, label, distance}, nearest first.
+        """
+        pass
+
+    # Async reads for request handlers. Backends without native async I/O
+    # run the sync version on a thread so the event loop is never blocked.
+    async def ainfluence(self, limit: int = 10, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.influence, limit, project_id)
+
+    async def ashortest_path(self, source: str, target: str, max_depth: int = 6, project_id: Optional[str] = None) -> List[str]:
+        return await asyncio.to_thread(self.shortest_path, source, target, max_depth, project_id)
+
+    async def aneighbourhood(self, name: str, depth: int = 1, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.neighbourhood, name, depth, project_id)
+
+    async def awrite(self, fn: Callable[["GraphService"], T]) -> T:
+        """
+        Run `fn(self)`, a sequence of the sync writes above, from async code.
+        """
+        return await asyncio.to_thread(fn, self)
+
+    def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        self.close()
+
+
+class Neo4jGraphService(GraphService):
+    """
+    Neo4j backend. Drivers are created on first use, so importing this
+    module (or starting the API) never opens a Bolt connection. An existing
+    driver can be passed in instead.
+
+    Request handlers use the async driver (`stream` and the a* reads), which
+    pulls NEO4J_FETCH_SIZE records per round-trip and yields them as they
+    arrive. The sync driver backs the writes and the sync read facade used
+    by scripts and the seeder.
+    """
+    INFLUENCE_QUERY = (
+        "MATCH (s:Stakeholder) WHERE $pid IS NULL OR s.project_id = $pid "
+        "RETURN s.name AS name, COALESCE(s.influence_score, 0) AS influence_score, "
+        "size([(s)--() | 1]) AS degree "
+        "ORDER BY influence_score DESC, degree DESC, name LIMIT $limit"
+    )
+    SHORTEST_PATH_QUERY = (
+        "MATCH (a:Stakeholder {{name: $source}}), (b:Stakeholder {{name: $target}}) "
+        "WHERE $pid IS NULL OR (a.project_id = $pid AND b.project_id = $pid) "
+        "MATCH p = shortestPath((a)-[*..{max_depth}]-(b)) "
+        "RETURN [n IN nodes(p) | COALESCE(n.name, n.id)] AS path LIMIT 1"
+    )
+    NEIGHBOURHOOD_QUERY = (
+        "MATCH (a:Stakeholder {{name: $name}}) WHERE $pid IS NULL OR a.project_id = $pid "
+        "MATCH p = (a)-[*1..{depth}]-(n) WHERE n <> a "
+        "RETURN COALESCE(n.name, n.id) AS name, labels(n)[0] AS label, MIN(length(p)) AS distance "
+        "ORDER BY distance, name"
+    )
+
+    def __init__(self, uri: Optional[str] = None, user: Optional[str] = None, password: Optional[str] = None, driver: Any = None, async_driver: Any = None):
+        self.uri = uri or settings.NEO4J_URI
+        self.auth = (user or settings.NEO4J_USER, password or settings.NEO4J_PASSWORD)
+        self._driver = driver
+        self._async_driver = async_driver
+
+    def _driver_options(self) -> Dict[str, Any]:
+        return {
+            "auth": self.auth,
+            "max_connection_pool_size": settings.NEO4J_MAX_POOL_SIZE,
+            "connection_acquisition_timeout": settings.NEO4J_ACQUISITION_TIMEOUT
+        }
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            from neo4j import GraphDatabase
+            self._driver = GraphDatabase.driver(self.uri, **self._driver_options())
+        return self._driver
+
+    @property
+    def async_driver(self):
+        if self._async_driver is None:
+            from neo4j import AsyncGraphDatabase
+            self._async_driver = AsyncGraphDatabase.driver(self.uri, **self._driver_options())
+        return self._async_driver
 
     def close(self):
-        self.driver.close()
+        if self._driver is not None:
+            self._driver.close()
+            self._driver = None
+
+    async def aclose(self):
+        self.close()
+        if self._async_driver is not None:
+            await self._async_driver.close()
+            self._async_driver = None
+
+    def query(self, cypher: str, parameters: Optional[Dict[str, Any]] = None) -> List[Any]:
+        return list(self.iter_query(cypher, parameters))
+
+    def iter_query(self, cypher: str, parameters: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+        """
+        Sync facade for scripts: records are pulled lazily in fetch-size batches.
+        """
+        with self.driver.session(fetch_size=settings.NEO4J_FETCH_SIZE) as session:
+            yield from session.run(cypher, parameters)
+
+    async def stream(self, cypher: str, parameters: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        async with self.async_driver.session(fetch_size=settings.NEO4J_FETCH_SIZE) as session:
+            result = await session.run(cypher, parameters)
+            async for record in result:
+                yield record.data()
+
+    async def _aquery(self, cypher: str, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [record async for record in self.stream(cypher, parameters)]
 
-    def query(self, cypher, parameters=None):
+    def ensure_indexes(self):
         with self.driver.session() as session:
-            result = session.run(cypher, parameters)
-            return [record for record in result]
+            for statement in (
+                "CREATE INDEX stakeholder_email IF NOT EXISTS FOR (s:Stakeholder) ON (s.email)",
+                "CREATE INDEX stakeholder_role IF NOT EXISTS FOR (s:Stakeholder) ON (s.id, s.project_id)",
+                "CREATE INDEX stakeholder_name IF NOT EXISTS FOR (s:Stakeholder) ON (s.name)",
+                "CREATE INDEX meeting_id IF NOT EXISTS FOR (m:Meeting) ON (m.id, m.project_id)",
+            ):
+                session.run(statement).consume()
+
+    # Each statement takes a whole batch as $rows, so a batch is one round-trip
+    def merge_email_stakeholders(self, emails, batch_size=None):
+        self._write_batches(
+            "UNWIND $rows AS row "
+            "MERGE (s:Stakeholder {email: row.email}) SET s.name = row.email",
+            [{"email": e} for e in emails], batch_size
+        )
+
+    def merge_communications(self, rows, batch_size=None):
+        self._write_batches(
+            "UNWIND $rows AS row "
+            "MATCH (s:Stakeholder {email: row.sender}), (r:Stakeholder {email: row.recipient}) "
+            "MERGE (s)-[c:COMMUNICATES_WITH {type: 'email'}]->(r) "
+            "SET c.weight = COALESCE(c.weight, 0) + row.weight",
+            rows, batch_size
+        )
+
+    def add_influence(self, rows, batch_size=None):
+        self._write_batches(
+            "UNWIND $rows AS row "
+            "MATCH (s:Stakeholder {email: row.email}) "
+            "SET s.influence_score = COALESCE(s.influence_score, 0) + row.score",
+            rows, batch_size
+        )
+
+    def merge_meetings(self, project_id, meeting_ids, batch_size=None):
+        self._write_batches(
+            "UNWIND $rows AS row "
+            "MERGE (m:Meeting {id: row.id, project_id: $pid})",
+            [{"id": m} for m in meeting_ids], batch_size, pid=project_id
+        )
+
+    def merge_role_stakeholders(self, project_id, roles, batch_size=None):
+        self._write_batches(
+            "UNWIND $rows AS row "
+            "MERGE (p:Stakeholder {id: row.role, project_id: $pid}) SET p.name = row.role",
+            [{"role": r} for r in roles], batch_size, pid=project_id
+        )
+
+    def merge_participation(self, project_id, rows, batch_size=None):
+        self._write_batches(
+            "UNWIND $rows AS row "
+            "MATCH (p:Stakeholder {id: row.role, project_id: $pid}), (m:Meeting {id: row.meeting_id, project_id: $pid}) "
+            "MERGE (p)-[:PARTICIPATED_IN]->(m)",
+            rows, batch_size, pid=project_id
+        )
+
+    def influence(self, limit=10, project_id=None):
+        records = self.query(self.INFLUENCE_QUERY, {"pid": project_id, "limit": limit})
+        return [dict(record) for record in records]
+
+    def shortest_path(self, source, target, max_depth=6, project_id=None):
+        if source == target:
+            return [source]
+        records = self.query(
+            self.SHORTEST_PATH_QUERY.format(max_depth=int(max_depth)),
+            {"source": source, "target": target, "pid": project_id}
+        )
+        return records[0]["path"] if records else []
+
+    def neighbourhood(self, name, depth=1, project_id=None):
+        records = self.query(self.NEIGHBOURHOOD_QUERY.format(depth=int(depth)), {"name": name, "pid": project_id})
+        return [dict(record) for record in records]
+
+    async def ainfluence(self, limit=10, project_id=None):
+        return await self._aquery(self.INFLUENCE_QUERY, {"pid": project_id, "limit": limit})
+
+    async def ashortest_path(self, source, target, max_depth=6, project_id=None):
+        if source == target:
+            return [source]
+        records = await self._aquery(
+            self.SHORTEST_PATH_QUERY.format(max_depth=int(max_depth)),
+            {"source": source, "target": target, "pid": project_id}
+        )
+        return records[0]["path"] if records else []
+
+    async def aneighbourhood(self, name, depth=1, project_id=None):
+        return await self._aquery(self.NEIGHBOURHOOD_QUERY.format(depth=int(depth)), {"name": name, "pid": project_id})
+
+    def _write_batches(self, statement: str, rows: List[Dict[str, Any]], batch_size: Optional[int] = None, **params):
+        batch_size = batch_size or settings.GRAPH_BATCH_SIZE
+        with self.driver.session() as session:
+            for start in range(0, len(rows), batch_size):
+                session.execute_write(self._run_batch, statement, rows[start:start + batch_size], params)
+
+    @staticmethod
+    def _run_batch(tx: Any, statement: str, rows: List[Dict[str, Any]], params: Dict[str, Any]):
+        tx.run(statement, rows=rows, **params).consume()
+
+
+NodeKey = Tuple[str, ...]
+
+
+class InMemoryGraphService(GraphService):
+    """
+    Adjacency-list backend for tests and single-node deployments.
+    Edges are stored once per direction so traversals can ignore direction,
+    matching the undirected patterns used by the Neo4j queries.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[NodeKey, Dict[str, Any]] = {}
+        self.edges: Dict[NodeKey, Dict[NodeKey, Dict[str, Any]]] = {}
+        self.adjacency: Dict[NodeKey, set] = {}
+
+    def _node(self, key: NodeKey, label: str, **props) -> Dict[str, Any]:
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = {"label": label}
+            self.adjacency[key] = set()
+        node.update(props)
+        return node
+
+    def _link(self, a: NodeKey, b: NodeKey) -> Dict[str, Any]:
+        self.adjacency[a].add(b)
+        self.adjacency[b].add(a)
+        return self.edges.setdefault(a, {}).setdefault(b, {})
+
+    def ensure_indexes(self):
+        pass
+
+    def merge_email_stakeholders(self, emails, batch_size=None):
+        for email in emails:
+            self._node(("email", email), "Stakeholder", email=email, name=email)
+
+    def merge_communications(self, rows, batch_size=None):
+        for row in rows:
+            sender, recipient = ("email", row["sender"]), ("email", row["recipient"])
+            if sender not in self.nodes or recipient not in self.nodes:
+                continue
+            edge = self._link(sender, recipient)
+            edge["weight"] = edge.get("weight", 0) + row["weight"]
+
+    def add_influence(self, rows, batch_size=None):
+        for row in rows:
+            node = self.nodes.get(("email", row["email"]))
+            if node is not None:
+                node["influence_score"] = node.get("influence_score", 0) + row["score"]
+
+    def merge_meetings(self, project_id, meeting_ids, batch_size=None):
+        for meeting_id in meeting_ids:
+            self._node(("meeting", project_id, meeting_id), "Meeting", id=meeting_id, project_id=project_id)
+
+    def merge_role_stakeholders(self, project_id, roles, batch_size=None):
+        for role in roles:
+            self._node(("role", project_id, role), "Stakeholder", id=role, project_id=project_id, name=role)
+
+    def merge_participation(self, project_id, rows, batch_size=None):
+        for row in rows:
+            role, meeting = ("role", project_id, row["role"]), ("meeting", project_id, row["meeting_id"])
+            if role in self.nodes and meeting in self.nodes:
+                self._link(role, meeting)
+
+    def influence(self, limit=10, project_id=None):
+        ranked = [
+            {
+                "name": node["name"],
+                "influence_score": node.get("influence_score", 0),
+                "degree": len(self.adjacency[key])
+            }
+            for key, node in self._stakeholders(project_id=project_id)
+        ]
+        ranked.sort(key=lambda r: (-r["influence_score"], -r["degree"], r["name"]))
+        return ranked[:limit]
+
+    def shortest_path(self, source, target, max_depth=6, project_id=None):
+        targets = {key for key, _ in self._stakeholders(target, project_id)}
+        for start, _ in self._stakeholders(source, project_id):
+            parents = self._bfs(start, max_depth)
+            hit = next((t for t in targets if t in parents), None)
+            if hit is not None:
+                path = []
+                while hit is not None:
+                    path.append(self._display(hit))
+                    hit = parents[hit]
+                return path[::-1]
+        return []
+
+    def neighbourhood(self, name, depth=1, project_id=None):
+        distances: Dict[NodeKey, int] = {}
+        for start, _ in self._stakeholders(name, project_id):
+            for key, distance in self._bfs(start, depth, with_distance=True).items():
+                if key != start and distance < distances.get(key, depth + 1):
+                    distances[key] = distance
+        result = [
+            {"name": self._display(key), "label": self.nodes[key]["label"], "distance": distance}
+            for key, distance in distances.items()
+        ]
+        result.sort(key=lambda r: (r["distance"], r["name"]))
+        return result
+
+    # Pure in-process work on structures that are not thread-safe, so the
+    # async reads and writes run inline rather than on a worker thread
+    async def ainfluence(self, limit=10, project_id=None):
+        return self.influence(limit, project_id)
+
+    async def ashortest_path(self, source, target, max_depth=6, project_id=None):
+        return self.shortest_path(source, target, max_depth, project_id)
+
+    async def aneighbourhood(self, name, depth=1, project_id=None):
+        return self.neighbourhood(name, depth, project_id)
+
+    async def awrite(self, fn):
+        return fn(self)
+
+    def _stakeholders(self, name: Optional[str] = None, project_id: Optional[str] = None) -> Iterable[Tuple[NodeKey, Dict[str, Any]]]:
+        for key, node in self.nodes.items():
+            if node["label"] != "Stakeholder":
+                continue
+            if name is not None and node.get("name") != name:
+                continue
+            if project_id is not None and node.get("project_id") != project_id:
+                continue
+            yield key, node
+
+    def _display(self, key: NodeKey) -> str:
+        node = self.nodes[key]
+        return node.get("name") or node.get("id")
+
+    def _bfs(self, start: NodeKey, max_depth: int, with_distance: bool = False) -> Dict[NodeKey, Any]:
+        """
+        Parent (or distance) of every node reachable within max_depth hops.
+        """
+        parents: Dict[NodeKey, Optional[NodeKey]] = {start: None}
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            key = queue.popleft()
+            if distances[key] == max_depth:
+                continue
+            for neighbour in self.adjacency[key]:
+                if neighbour not in parents:
+                    parents[neighbour] = key
+                    distances[neighbour] = distances[key] + 1
+                    queue.append(neighbour)
+        return distances if with_distance else parents
+
+
+_graph_service: Optional[GraphService] = None
+
+
+def get_graph_service() -> GraphService:
+    global _graph_service
+    if _graph_service is None:
+        if settings.GRAPH_BACKEND == "memory":
+            _graph_service = InMemoryGraphService()
+        else:
+            _graph_service = Neo4jGraphService()
+    return _graph_service
+
+
+async def close_graph_service() -> None:
+    global _graph_service
+    if _graph_service is not None:
+        await _graph_service.aclose()
+        _graph_service = None
+
 
-graph_db = GraphService()
+def __getattr__(name: str):
+    # `graph_db` used to be built at import time; resolve it on first access instead
+    if name == "graph_db":
+        return get_graph_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
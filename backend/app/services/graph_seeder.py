@@ -1,69 +1,118 @@
-from app.services.connectors.base import BaseConnector
-from typing import List, Dict, Any
+from collections import Counter
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+from app.services.graph import GraphService, Neo4jGraphService
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class EnronGraphRows:
+    """
+    Enron stakeholders and per-(sender, recipient) email counts, accumulated
+    one email at a time, so a streamed corpus is never held in memory.
+    Parsed records (the dataset cache schema) carry the same sender and
+    recipients fields as raw emails.
+    """
+
+    def __init__(self):
+        self.stakeholders: Set[str] = set()
+        self.edges: Counter = Counter()
+
+    def add(self, email: Dict[str, Any]) -> None:
+        sender = email.get("sender")
+        if not sender:
+            return
+        self.stakeholders.add(sender)
+        for recipient in email.get("recipients") or []:
+            self.stakeholders.add(recipient)
+            self.edges[sender, recipient] += 1
+
+    def seed(self, graph: GraphService, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        Write the accumulated graph. A sender's influence_score grows by one
+        per recipient per email; repeated pairs become one weighted edge.
+        """
+        influence: Counter = Counter()
+        for (sender, _), weight in self.edges.items():
+            influence[sender] += weight
+
+        graph.ensure_indexes()
+        graph.merge_email_stakeholders(list(self.stakeholders), batch_size)
+        graph.merge_communications([
+            {"sender": s, "recipient": r, "weight": w}
+            for (s, r), w in self.edges.items()
+        ], batch_size)
+        graph.add_influence([
+            {"email": e, "score": score}
+            for e, score in influence.items()
+        ], batch_size)
+        return {"stakeholders": len(self.stakeholders), "edges": len(self.edges)}
+
+
+class AMIGraphRows:
+    """
+    AMI meetings, speaker roles and who took part in which meeting for one
+    project, accumulated one meeting at a time.
+    """
+
+    def __init__(self, project_id: str):
+        self.project_id = project_id
+        self.meeting_ids: Set[str] = set()
+        self.roles: Set[str] = set()
+        self.participation: Set[Tuple[str, str]] = set()
+
+    def add(self, meeting: Dict[str, Any]) -> None:
+        """
+        `meeting` is a raw meeting ({meeting_id, participants}) or a parsed
+        record, whose speakers are its `recipients`.
+        """
+        meeting_id = meeting.get("meeting_id")
+        self.meeting_ids.add(meeting_id)
+        participants: List[str] = meeting.get("participants") or meeting.get("recipients") or []
+        for role in participants:
+            self.roles.add(role)
+            self.participation.add((role, meeting_id))
+
+    def seed(self, graph: GraphService, batch_size: Optional[int] = None) -> Dict[str, int]:
+        graph.ensure_indexes()
+        graph.merge_meetings(self.project_id, list(self.meeting_ids), batch_size)
+        graph.merge_role_stakeholders(self.project_id, list(self.roles), batch_size)
+        graph.merge_participation(self.project_id, [
+            {"role": role, "meeting_id": meeting_id} for role, meeting_id in self.participation
+        ], batch_size)
+        return {"meetings": len(self.meeting_ids), "stakeholders": len(self.roles), "participations": len(self.participation)}
+
+
 class GraphSeeder:
     """
-    Seeds Neo4j with organizational and decision graphs from datasets.
+    Seeds the stakeholder graph with organizational and decision graphs from datasets.
+
+    Input is aggregated client-side first (one row per node or edge), then
+    handed to a GraphService; the Neo4j backend writes each row set with
+    batched UNWIND statements, each batch in its own write transaction.
     """
 
     @staticmethod
-    def seed_enron_hierarchy(emails: List[Dict[str, Any]], driver: Any):
+    def _as_graph(graph: Any) -> GraphService:
+        # Callers may still pass a raw neo4j driver
+        return graph if isinstance(graph, GraphService) else Neo4jGraphService(driver=graph)
+
+    @staticmethod
+    def seed_enron_hierarchy(emails: Iterable[Dict[str, Any]], graph: Any, batch_size: Optional[int] = None) -> Dict[str, int]:
         """
-        Maps Enron CC/BCC patterns to stakeholder influence.
+        Maps Enron CC/BCC patterns to stakeholder influence (see EnronGraphRows).
         """
-        with driver.session() as session:
-            for email in emails:
-                sender = email.get("sender")
-                recipients = email.get("recipients", [])
-                
-                # Create Sender
-                session.run(
-                    "MERGE (s:Stakeholder {email: $email}) SET s.name = $email",
-                    email=sender
-                )
-                
-                # Create Recipients and Relationships
-                for recipient in recipients:
-                    session.run(
-                        "MERGE (r:Stakeholder {email: $email}) SET r.name = $email",
-                        email=recipient
-                    )
-                    session.run(
-                        "MATCH (s:Stakeholder {email: $sender}), (r:Stakeholder {email: $recipient}) "
-                        "MERGE (s)-[:COMMUNICATES_WITH {type: 'email'}]->(r) "
-                        "WITH s, r "
-                        "SET s.influence_score = COALESCE(s.influence_score, 0) + 1",
-                        sender=sender, recipient=recipient
-                    )
+        rows = EnronGraphRows()
+        for email in emails:
+            rows.add(email)
+        return rows.seed(GraphSeeder._as_graph(graph), batch_size)
 
     @staticmethod
-    def seed_ami_decisions(meetings: List[Dict[str, Any]], project_id: str, driver: Any):
+    def seed_ami_decisions(meetings: Iterable[Dict[str, Any]], project_id: str, graph: Any, batch_size: Optional[int] = None) -> Dict[str, int]:
         """
         Maps AMI roles to requirement decisions in the graph.
         """
-        with driver.session() as session:
-            for meeting in meetings:
-                meeting_id = meeting.get("meeting_id")
-                participants = meeting.get("participants", [])
-                
-                # Create Meeting Node
-                session.run(
-                    "MERGE (m:Meeting {id: $id, project_id: $pid})",
-                    id=meeting_id, pid=project_id
-                )
-                
-                for role in participants:
-                    # Create Role Node
-                    session.run(
-                        "MERGE (p:Stakeholder {id: $role, project_id: $pid}) SET p.name = $role",
-                        role=role, pid=project_id
-                    )
-                    # Link to Meeting
-                    session.run(
-                        "MATCH (p:Stakeholder {id: $role, project_id: $pid}), (m:Meeting {id: $id, project_id: $pid}) "
-                        "MERGE (p)-[:PARTICIPATED_IN]->(m)",
-                        role=role, pid=project_id, id=meeting_id
-                    )
+        rows = AMIGraphRows(project_id)
+        for meeting in meetings:
+            rows.add(meeting)
+        return rows.seed(GraphSeeder._as_graph(graph), batch_size)
@@ -1,8 +1,11 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 from app.models import models
+from app.core.config import settings
+from app.services.conflict_engine import ConflictEngine
 from datetime import datetime, timedelta
-import statistics
+from uuid import UUID
 
 class IntelligenceService:
     @staticmethod
@@ -10,24 +13,66 @@ class IntelligenceService:
         """
         SAS = 100 * (1 - (sum(ConflictWeight * Density) + sum(SentimentVariance)) / TotalReq)
         """
-        requirements = db.query(models.Requirement).filter(models.Requirement.project_id == project_id).all()
-        if not requirements:
+        total_req_count, sentiment_sum, sentiment_sumsq = IntelligenceService.sentiment_stats(project_id, db)
+        if not total_req_count:
             return 100.0
         
-        conflicts = db.query(models.Conflict).filter(models.Conflict.project_id == project_id, models.Conflict.is_resolved == False).all()
-        
-        total_req_count = len(requirements)
-        
         # Conflict component
-        conflict_impact = 0.0
-        for conflict in conflicts:
-            # Gravity = Severity * 1.5 (if multi-stakeholder involved, simplified here)
-            conflict_impact += (conflict.severity_score or 0.5) * 1.2
+        _, severity_sum = IntelligenceService.open_conflict_stats(project_id, db)
             
-        # Sentiment Variance component
-        sentiments = [r.sentiment_score for r in requirements]
-        sentiment_variance = statistics.variance(sentiments) if len(sentiments) > 1 else 0.0
+        # Sentiment Variance component (sample variance, as statistics.variance)
+        sentiment_variance = IntelligenceService.variance_from_sums(total_req_count, sentiment_sum, sentiment_sumsq)
         
+        return IntelligenceService.alignment_from_stats(total_req_count, sentiment_variance, severity_sum)
+
+    @staticmethod
+    def sentiment_stats(project_id: str, db: Session) -> Tuple[int, float, float]:
+        """
+        (COUNT, SUM, SUM of squares) of requirement sentiment, in one aggregate query.
+        """
+        score = func.coalesce(models.Requirement.sentiment_score, 0.0)
+        count, total, total_sq = db.query(
+            func.count(models.Requirement.id),
+            func.sum(score),
+            func.sum(score * score)
+        ).filter(models.Requirement.project_id == project_id).one()
+        return count or 0, float(total or 0.0), float(total_sq or 0.0)
+
+    @staticmethod
+    def open_conflict_stats(project_id: str, db: Session) -> Tuple[int, float]:
+        """
+        (COUNT, sum of severity) over unresolved conflicts. Missing or zero
+        severities weigh 0.5, as `severity_score or 0.5` always has.
+        """
+        count, severity_sum = db.query(
+            func.count(models.Conflict.id),
+            func.sum(IntelligenceService.severity_weight())
+        ).filter(
+            models.Conflict.project_id == project_id,
+            models.Conflict.is_resolved == False
+        ).one()
+        return count or 0, float(severity_sum or 0.0)
+
+    @staticmethod
+    def severity_weight():
+        return func.coalesce(func.nullif(models.Conflict.severity_score, 0.0), 0.5)
+
+    @staticmethod
+    def variance_from_sums(count: int, total: float, total_sq: float) -> float:
+        if count < 2:
+            return 0.0
+        return max((total_sq - total * total / count) / (count - 1), 0.0)
+
+    @staticmethod
+    def alignment_from_stats(total_req_count: int, sentiment_variance: float, severity_sum: float) -> float:
+        """
+        The SAS formula on pre-aggregated inputs. `severity_sum` is the sum of
+        (severity_score or 0.5) over unresolved conflicts.
+        """
+        if total_req_count == 0:
+            return 100.0
+        # Gravity = Severity * 1.5 (if multi-stakeholder involved, simplified here)
+        conflict_impact = severity_sum * 1.2
         sas = 100 * (1 - (conflict_impact + (sentiment_variance * 5)) / (total_req_count * 2))
         return max(min(sas, 100.0), 0.0)
 
@@ -46,6 +91,12 @@ class IntelligenceService:
             models.RequirementRevision.created_at >= thirty_days_ago
         ).count()
         
+        return IntelligenceService.stability_from_stats(total_reqs, recent_changes)
+
+    @staticmethod
+    def stability_from_stats(total_reqs: int, recent_changes: int) -> float:
+        if total_reqs == 0:
+            return 100.0
         # RSI Formula: 1 - (Changes / Total)
         change_ratio = recent_changes / (total_reqs * 5) # Weighted denominator
         rsi = (1 - change_ratio) * 100
@@ -59,7 +110,66 @@ class IntelligenceService:
         """
         sas = IntelligenceService.calculate_alignment_score(project_id, db)
         rsi = IntelligenceService.calculate_stability_index(project_id, db)
-        
+        return IntelligenceService.risk_from_scores(sas, rsi)
+
+    @staticmethod
+    def portfolio_metrics(project_ids: List[UUID], db: Session) -> Dict[UUID, Dict[str, Any]]:
+        """
+        SAS, RSI, risk and conflict counts for many projects at once.
+        Three GROUP BY project_id queries regardless of how many projects
+        are passed; the formulas are the per-project ones above.
+        """
+        if not project_ids:
+            return {}
+        score = func.coalesce(models.Requirement.sentiment_score, 0.0)
+        requirement_stats = {
+            row.project_id: row for row in db.query(
+                models.Requirement.project_id,
+                func.count(models.Requirement.id).label("count"),
+                func.sum(score).label("total"),
+                func.sum(score * score).label("total_sq")
+            ).filter(
+                models.Requirement.project_id.in_(project_ids)
+            ).group_by(models.Requirement.project_id)
+        }
+        conflict_stats = {
+            row.project_id: row for row in db.query(
+                models.Conflict.project_id,
+                func.count(models.Conflict.id).label("count"),
+                func.sum(IntelligenceService.severity_weight()).label("severity_sum")
+            ).filter(
+                models.Conflict.project_id.in_(project_ids),
+                models.Conflict.is_resolved == False
+            ).group_by(models.Conflict.project_id)
+        }
+        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        recent_changes = dict(db.query(
+            models.Requirement.project_id,
+            func.count(models.RequirementRevision.id)
+        ).join(models.Requirement).filter(
+            models.Requirement.project_id.in_(project_ids),
+            models.RequirementRevision.created_at >= thirty_days_ago
+        ).group_by(models.Requirement.project_id).all())
+
+        portfolio = {}
+        for project_id in project_ids:
+            reqs = requirement_stats.get(project_id)
+            conflicts = conflict_stats.get(project_id)
+            count = reqs.count if reqs else 0
+            variance = IntelligenceService.variance_from_sums(count, float(reqs.total or 0.0), float(reqs.total_sq or 0.0)) if reqs else 0.0
+            sas = IntelligenceService.alignment_from_stats(count, variance, float(conflicts.severity_sum or 0.0) if conflicts else 0.0)
+            rsi = IntelligenceService.stability_from_stats(count, recent_changes.get(project_id, 0))
+            portfolio[project_id] = {
+                "alignment_score": sas,
+                "stability_index": rsi,
+                "risk_forecast": IntelligenceService.risk_from_scores(sas, rsi),
+                "requirement_count": count,
+                "open_conflicts": conflicts.count if conflicts else 0
+            }
+        return portfolio
+
+    @staticmethod
+    def risk_from_scores(sas: float, rsi: float) -> Dict[str, Any]:
         # Heuristic: Risk increases if Alignment is low AND Stability is low
         risk_score = ( (100 - sas) * 0.6 ) + ( (100 - rsi) * 0.4 )
         
@@ -77,63 +187,91 @@ class IntelligenceService:
                 "volatility_risk": "High" if rsi < 70 else "Low"
             }
         }
+
     @staticmethod
-    def detect_conflicts(project_id: str, db: Session) -> List[models.Conflict]:
+    def detect_conflicts(project_id: str, db: Session, full: bool = False) -> List[models.Conflict]:
         """
         HEURISTIC: Cross-compare requirements to find potential semantic contradictions.
         In a real SaaS, this would use Gemini embeddings + vector similarity.
+
+        Incremental by default: only requirements created since the project's
+        watermark are compared against the corpus (new x all). `created_at` is
+        stamped before commit, so a row can become visible after a pass that
+        already moved the watermark past it; each delta therefore reaches back
+        CONFLICT_WATERMARK_LAG_SECONDS behind the watermark. Conflicts are
+        upserted by the unordered (req_a_id, req_b_id) pair, so the overlap
+        (and any re-run) never duplicates rows. `full=True` rescans every pair.
         """
-        # [PROTOTYPE] Keep existing conflicts for demonstration
-        # db.query(models.Conflict).filter(
-        #     models.Conflict.project_id == project_id,
-        #     models.Conflict.is_resolved == False
-        # ).delete()
+        watermark = db.query(models.ConflictWatermark).filter(
+            models.ConflictWatermark.project_id == project_id
+        ).first()
+        since = None
+        if not full and watermark is not None and watermark.last_created_at is not None:
+            since = watermark.last_created_at - timedelta(seconds=settings.CONFLICT_WATERMARK_LAG_SECONDS)
 
-        requirements = db.query(models.Requirement).filter(
+        # Only the columns the rules look at; the ORM objects are not needed.
+        # Stable ordering keeps pair orientation identical across delta runs.
+        requirements = db.query(
+            models.Requirement.id,
+            models.Requirement.text,
+            models.Requirement.category,
+            models.Requirement.created_at
+        ).filter(
             models.Requirement.project_id == project_id
-        ).all()
+        ).order_by(models.Requirement.created_at, models.Requirement.id).all()
+
+        new_positions = None
+        if since is not None:
+            new_positions = {
+                pos for pos, req in enumerate(requirements)
+                if req.created_at is not None and req.created_at >= since
+            }
+            if not new_positions:
+                return []
+
+        # Existing conflicts for the touched requirements, keyed by unordered pair
+        existing_query = db.query(models.Conflict).filter(models.Conflict.project_id == project_id)
+        if new_positions is not None:
+            new_ids = [requirements[pos].id for pos in new_positions]
+            existing_query = existing_query.filter(or_(
+                models.Conflict.req_a_id.in_(new_ids),
+                models.Conflict.req_b_id.in_(new_ids)
+            ))
+        existing = {
+            frozenset((c.req_a_id, c.req_b_id)): c
+            for c in existing_query.all()
+            if c.req_a_id is not None and c.req_b_id is not None
+        }
 
         detected = []
-        # Basic quadratic comparison (fine for prototype)
-        for i in range(len(requirements)):
-            for j in range(i + 1, len(requirements)):
-                req_a = requirements[i]
-                req_b = requirements[j]
-
-                # Rule 1: Shared category + opposing keywords (Prototype Mock)
-                # Example: "fast" vs "thorough/slow" in same category
-                is_conflict = False
-                severity = 0.5
-                conflict_type = "functional"
-
-                # Simulate detection logic (Langchain/Gemini would do this for real)
-                # Here we mock it with some simple logic
-                low_a = req_a.text.lower()
-                low_b = req_b.text.lower()
-
-                if req_a.category == req_b.category and req_a.category is not None:
-                    # Timeline conflict detection
-                    if "month" in low_a and "month" in low_b:
-                        is_conflict = True
-                        severity = 0.85
-                        conflict_type = "timeline"
-                    # Scope conflict detection
-                    elif "all" in low_a and "except" in low_b:
-                        is_conflict = True
-                        severity = 0.7
-                        conflict_type = "scope"
-
-                if is_conflict:
-                    conflict = models.Conflict(
-                        project_id=project_id,
-                        req_a_id=req_a.id,
-                        req_b_id=req_b.id,
-                        conflict_type=conflict_type,
-                        severity_score=severity,
-                        is_resolved=False
-                    )
-                    db.add(conflict)
-                    detected.append(conflict)
-        
+        # Indexed candidate generation: only pairs sharing a rule bucket are scored
+        for req_a, req_b, rule in ConflictEngine().find_conflicts(requirements, new_positions):
+            conflict = existing.get(frozenset((req_a.id, req_b.id)))
+            if conflict is not None:
+                # Resolved conflicts stay resolved; open ones pick up the latest rule
+                if not conflict.is_resolved:
+                    conflict.conflict_type = rule.conflict_type
+                    conflict.severity_score = rule.severity
+                continue
+            conflict = models.Conflict(
+                project_id=project_id,
+                req_a_id=req_a.id,
+                req_b_id=req_b.id,
+                conflict_type=rule.conflict_type,
+                severity_score=rule.severity,
+                is_resolved=False
+            )
+            db.add(conflict)
+            detected.append(conflict)
+
+        # Advance the high-water mark to the newest requirement scanned
+        newest = max((r.created_at for r in requirements if r.created_at is not None), default=None)
+        if newest is not None:
+            if watermark is None:
+                watermark = models.ConflictWatermark(project_id=project_id)
+                db.add(watermark)
+            if watermark.last_created_at is None or newest > watermark.last_created_at:
+                watermark.last_created_at = newest
+
         db.commit()
         return detected
@@ -0,0 +1,290 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models import models
+from app.services.ingestion import IngestionService
+from app.utils.encryption import decrypt_token, encrypt_token
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {"succeeded", "failed", "cancelled"}
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once cancellation has been requested."""
+
+
+class JobBackend(ABC):
+    """
+    Transport for queued job ids. Job state itself lives in the jobs table.
+    `durable` backends keep queued ids across an API restart.
+    """
+    durable: bool = True
+
+    @abstractmethod
+    async def enqueue(self, job_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def dequeue(self, timeout: float = 1.0) -> Optional[str]:
+        """
+        Next job id, or None if nothing arrived within `timeout` seconds.
+        """
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class InProcessJobBackend(JobBackend):
+    """
+    asyncio.Queue in the API process. Jobs queued here do not survive a
+    restart; IngestionJobManager.recover() re-queues them on startup.
+    """
+    durable = False
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def enqueue(self, job_id: str) -> None:
+        await self.queue.put(job_id)
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[str]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class RedisJobBackend(JobBackend):
+    """
+    Redis list shared by every API/worker process. Any client exposing the
+    async `rpush`/`blpop`/`aclose` subset of redis.asyncio works, so tests can
+    pass an in-memory fake instead of a server.
+    """
+    QUEUE_KEY = "insightbrd:ingestion_jobs"
+
+    def __init__(self, client: Any = None, url: Optional[str] = None):
+        if client is None:
+            import redis.asyncio as redis
+            client = redis.from_url(url or settings.REDIS_URL, decode_responses=True)
+        self.client = client
+
+    async def enqueue(self, job_id: str) -> None:
+        await self.client.rpush(self.QUEUE_KEY, job_id)
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[str]:
+        item = await self.client.blpop([self.QUEUE_KEY], timeout=max(1, int(timeout)))
+        if item is None:
+            return None
+        job_id = item[1]
+        return job_id.decode() if isinstance(job_id, bytes) else job_id
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class IngestionJobManager:
+    """
+    Runs IngestionService in a pool of asyncio workers fed by a JobBackend,
+    recording status, stage and progress on the IngestionJob row. Workers use
+    AsyncSessions, so a running ingest never blocks the API's event loop on
+    the database.
+    """
+
+    def __init__(self, backend: JobBackend, workers: int = 2, session_factory=AsyncSessionLocal):
+        self.backend = backend
+        self.workers = workers
+        self.session_factory = session_factory
+        self._worker_tasks: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+
+    async def start(self) -> None:
+        if self._worker_tasks:
+            return
+        try:
+            await self.recover()
+        except Exception:
+            logger.exception("Recovering interrupted ingestion jobs failed")
+        self._worker_tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in list(self._running.values()) + self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, *self._running.values(), return_exceptions=True)
+        self._worker_tasks = []
+        self._running = {}
+        await self.backend.close()
+
+    async def submit(
+        self,
+        db: AsyncSession,
+        project_id: UUID,
+        channel_type: str,
+        config: Dict[str, Any],
+        user_id: Optional[UUID] = None
+    ) -> models.IngestionJob:
+        job = models.IngestionJob(
+            project_id=project_id,
+            user_id=user_id,
+            channel_type=channel_type,
+            config=encrypt_token(json.dumps(config or {})),
+            status="queued",
+            stage="queued",
+            progress=0.0
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        await self.backend.enqueue(str(job.id))
+        return job
+
+    async def recover(self) -> None:
+        """
+        Startup recovery for a non-durable backend, whose queue and running
+        tasks died with the previous process: jobs it left running are
+        marked failed (an ingest is not safely resumable mid-way) and jobs it
+        left queued are queued again. With a durable backend queued ids are
+        still in the queue, and a running job may belong to another live
+        worker process, so nothing is touched.
+        """
+        if self.backend.durable:
+            return
+        async with self.session_factory() as db:
+            await db.execute(update(models.IngestionJob).where(
+                models.IngestionJob.status == "running"
+            ).values(
+                status="failed", stage="failed", finished_at=datetime.utcnow(),
+                error="Interrupted by an API restart"
+            ))
+            queued = (await db.execute(select(models.IngestionJob.id).where(
+                models.IngestionJob.status == "queued"
+            ).order_by(models.IngestionJob.created_at))).scalars().all()
+            await db.commit()
+        for job_id in queued:
+            await self.backend.enqueue(str(job_id))
+        if queued:
+            logger.info(f"Re-queued {len(queued)} ingestion jobs left over from the previous run")
+
+    async def cancel(self, db: AsyncSession, job_id: UUID) -> Optional[models.IngestionJob]:
+        """
+        Request cancellation; None if the job does not exist. Queued jobs are
+        cancelled outright; running jobs stop at the next stage boundary (or
+        immediately if running in this process). Both status changes are
+        conditional UPDATEs, so a worker claiming the job concurrently either
+        sees it cancelled or is the one that gets cancel_requested.
+        """
+        jobs = models.IngestionJob.__table__
+        cancelled = await db.execute(update(jobs).where(
+            jobs.c.id == job_id, jobs.c.status == "queued"
+        ).values(
+            status="cancelled", stage="cancelled", cancel_requested=True, finished_at=datetime.utcnow()
+        ))
+        if cancelled.rowcount == 0:
+            await db.execute(update(jobs).where(
+                jobs.c.id == job_id, jobs.c.status.not_in(sorted(TERMINAL_STATUSES))
+            ).values(cancel_requested=True))
+        await db.commit()
+
+        # Runs on the event loop that owns the task (async endpoint)
+        task = self._running.get(str(job_id))
+        if task is not None:
+            task.cancel()
+        return await db.get(models.IngestionJob, job_id, populate_existing=True)
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            try:
+                job_id = await self.backend.dequeue()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {worker_id} failed to dequeue: {e}")
+                await asyncio.sleep(1)
+                continue
+            if job_id is None:
+                continue
+
+            task = asyncio.create_task(self._run(job_id))
+            self._running[job_id] = task
+            try:
+                await task
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise
+            finally:
+                self._running.pop(job_id, None)
+
+    async def _run(self, job_id: str) -> None:
+        async with self.session_factory() as db:
+            # Claim the job: only one worker (and never a cancelled job) gets past this
+            claimed = await db.execute(update(models.IngestionJob.__table__).where(
+                models.IngestionJob.id == UUID(job_id), models.IngestionJob.status == "queued"
+            ).values(status="running", started_at=datetime.utcnow()))
+            await db.commit()
+            if claimed.rowcount == 0:
+                return
+            job = await db.get(models.IngestionJob, UUID(job_id))
+
+            async def progress(stage: str, fraction: float):
+                await db.refresh(job, ["cancel_requested"])
+                if job.cancel_requested:
+                    raise JobCancelled()
+                job.stage = stage
+                job.progress = fraction
+                await db.commit()
+
+            try:
+                result = await IngestionService.ingest_from_channel(
+                    project_id=job.project_id,
+                    channel_type=job.channel_type,
+                    config=json.loads(decrypt_token(job.config) or "{}"),
+                    db=db,
+                    user_id=job.user_id,
+                    progress=progress
+                )
+            except (JobCancelled, asyncio.CancelledError):
+                await db.rollback()
+                await self._finish(db, job, "cancelled")
+                return
+            except Exception as e:
+                logger.exception(f"Ingestion job {job_id} failed")
+                await db.rollback()
+                await self._finish(db, job, "failed", error=str(e))
+                return
+
+            if "error" in result:
+                await self._finish(db, job, "failed", error=result["error"])
+            else:
+                await self._finish(db, job, "succeeded", result=result)
+
+    @staticmethod
+    async def _finish(db: AsyncSession, job: models.IngestionJob, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        job.status = status
+        job.stage = status
+        job.finished_at = datetime.utcnow()
+        if status == "succeeded":
+            job.progress = 1.0
+        if result is not None:
+            job.result = json.loads(json.dumps(result, default=str))
+        job.error = error
+        await db.commit()
+
+
+def _build_backend() -> JobBackend:
+    if settings.JOB_BACKEND == "redis":
+        return RedisJobBackend()
+    return InProcessJobBackend()
+
+
+job_manager = IngestionJobManager(_build_backend(), workers=settings.JOB_WORKERS)
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+
+class LLMCache:
+    """
+    Content-addressed cache for LLM responses.
+
+    Two tiers: an in-memory LRU for the hot set, backed by a SQLite file with
+    a size cap and TTL so results survive restarts. Values must be
+    JSON-serialisable; callers always get a fresh copy back.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        max_memory_items: int = 1024,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: int = 7 * 24 * 3600
+    ):
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+
+        self._conn = None
+        self._disk_bytes = 0
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed ON llm_cache (accessed_at)")
+            self._conn.commit()
+            self._disk_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    @staticmethod
+    def make_key(model: str, template: str, text: str, temperature: float) -> str:
+        payload = json.dumps([model, template, text, temperature], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return json.loads(value)
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created_at = row
+                    if now - created_at <= self.ttl_seconds:
+                        self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._conn.commit()
+                        self._remember(key, value, created_at)
+                        self.hits += 1
+                        return json.loads(value)
+                    self._delete_disk([key])
+                    self._conn.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        encoded = json.dumps(value)
+        with self._lock:
+            self._remember(key, encoded, now)
+            if self._conn is not None:
+                self._delete_disk([key])
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, encoded, len(encoded), now, now)
+                )
+                self._disk_bytes += len(encoded)
+                self._evict_disk(now)
+                self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+                self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.hits - self.memory_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "memory_items": len(self._memory)
+        }
+
+    def _remember(self, key: str, encoded: str, created_at: float):
+        self._memory[key] = (encoded, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _delete_disk(self, keys):
+        for key in keys:
+            row = self._conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._disk_bytes -= row[0]
+
+    def _evict_disk(self, now: float):
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+        # Expired rows go first (they are otherwise only dropped when read)
+        expired = [k for (k,) in self._conn.execute(
+            "SELECT key FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).fetchall()]
+        self._delete_disk(expired)
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+        # Then least recently used rows until back under the cap
+        doomed = []
+        freed = 0
+        overflow = self._disk_bytes - self.max_disk_bytes
+        for key, size in self._conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at"):
+            doomed.append(key)
+            freed += size
+            if freed >= overflow:
+                break
+        self._delete_disk(doomed)
+        for key in doomed:
+            self._memory.pop(key, None)
+
+
+llm_cache = LLMCache(
+    settings.LLM_CACHE_PATH or None,
+    max_memory_items=settings.LLM_CACHE_MEMORY_ITEMS,
+    max_disk_bytes=settings.LLM_CACHE_MAX_BYTES,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS
+)
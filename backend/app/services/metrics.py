@@ -0,0 +1,378 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, func, insert, inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.session import insert_missing
+from app.models import models
+from app.services.intelligence import IntelligenceService
+
+REVISION_WINDOW_DAYS = 30
+
+
+def _batch_stats(values: List[float]) -> Tuple[int, float, float]:
+    n = len(values)
+    if n == 0:
+        return 0, 0.0, 0.0
+    mean = sum(values) / n
+    return n, mean, sum((v - mean) ** 2 for v in values)
+
+
+def _merge(n_a: int, mean_a: float, m2_a: float, n_b: int, mean_b: float, m2_b: float) -> Tuple[int, float, float]:
+    """
+    Welford/Chan combination of two (count, mean, M2) summaries.
+    """
+    n = n_a + n_b
+    if n == 0:
+        return 0, 0.0, 0.0
+    delta = mean_b - mean_a
+    return n, mean_a + delta * n_b / n, m2_a + m2_b + delta * delta * n_a * n_b / n
+
+
+def _subtract(n: int, mean: float, m2: float, n_b: int, mean_b: float, m2_b: float) -> Tuple[int, float, float]:
+    """
+    Inverse of _merge: remove the summary (n_b, mean_b, m2_b) from (n, mean, m2).
+    """
+    n_a = n - n_b
+    if n_a <= 0:
+        return 0, 0.0, 0.0
+    mean_a = (n * mean - n_b * mean_b) / n_a
+    delta = mean_b - mean_a
+    m2_a = m2 - m2_b - delta * delta * n_a * n_b / n
+    return n_a, mean_a, max(m2_a, 0.0)
+
+
+def _severity(conflict_severity: Optional[float]) -> float:
+    # Same weighting as calculate_alignment_score: missing or zero severity counts as 0.5
+    return conflict_severity or 0.5
+
+
+class ProjectMetricsService:
+    """
+    Per-project rollup behind the intelligence summary.
+
+    project_metrics keeps the requirement count, a Welford running mean/M2
+    of sentiment, and the open-conflict count and severity sum;
+    project_revision_buckets keeps revisions per day. Both are updated in
+    the same flush as the rows they summarise (see the before_flush hook
+    below), so reading the summary is a primary-key lookup plus at most
+    REVISION_WINDOW_DAYS + 1 bucket rows.
+
+    A project without a metrics row (one that predates the rollup, or was
+    never written to) gets it from the raw tables: on the first read, or
+    inside the first write's transaction, so a write racing that first read
+    is never dropped.
+    """
+
+    @staticmethod
+    def rebuild(project_id: UUID, db: Session) -> models.ProjectMetrics:
+        """
+        Recompute the rollup from the raw tables and commit it.
+        """
+        # Pending rows must be visible to the aggregates below
+        db.flush()
+        values, buckets = ProjectMetricsService._aggregate(project_id, db)
+        metrics = db.get(models.ProjectMetrics, project_id) or models.ProjectMetrics(project_id=project_id)
+        for column, value in values.items():
+            setattr(metrics, column, value)
+        db.add(metrics)
+
+        db.query(models.ProjectRevisionBucket).filter(
+            models.ProjectRevisionBucket.project_id == project_id
+        ).delete(synchronize_session=False)
+        db.add_all([
+            models.ProjectRevisionBucket(project_id=project_id, day=day, revision_count=n)
+            for day, n in buckets.items()
+        ])
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent request built the rollup first; theirs is just as fresh
+            db.rollback()
+            return db.get(models.ProjectMetrics, project_id)
+        return metrics
+
+    @staticmethod
+    def _aggregate(project_id: UUID, db: Session) -> Tuple[Dict[str, Any], Dict[date, int]]:
+        """
+        The project_metrics columns and the per-day revision counts inside the
+        window, computed from the raw tables as this transaction sees them.
+        """
+        count, mean = db.query(
+            func.count(models.Requirement.id),
+            func.avg(func.coalesce(models.Requirement.sentiment_score, 0.0))
+        ).filter(models.Requirement.project_id == project_id).one()
+        mean = float(mean or 0.0)
+        # Second pass around the mean keeps M2 numerically stable
+        m2 = db.query(
+            func.sum((func.coalesce(models.Requirement.sentiment_score, 0.0) - mean) * (func.coalesce(models.Requirement.sentiment_score, 0.0) - mean))
+        ).filter(models.Requirement.project_id == project_id).scalar()
+
+        conflict_count, severity_sum = IntelligenceService.open_conflict_stats(project_id, db)
+
+        # Revision buckets only matter inside the window
+        since = datetime.combine(datetime.utcnow().date() - timedelta(days=REVISION_WINDOW_DAYS), datetime.min.time())
+        buckets: Dict[date, int] = defaultdict(int)
+        for (created_at,) in db.query(models.RequirementRevision.created_at).join(models.Requirement).filter(
+            models.Requirement.project_id == project_id,
+            models.RequirementRevision.created_at >= since
+        ):
+            buckets[created_at.date()] += 1
+
+        values = {
+            "requirement_count": count,
+            "sentiment_mean": mean,
+            "sentiment_m2": float(m2 or 0.0),
+            "unresolved_conflict_count": conflict_count,
+            "unresolved_severity_sum": severity_sum
+        }
+        return values, buckets
+
+    @staticmethod
+    def get(project_id: UUID, db: Session) -> models.ProjectMetrics:
+        metrics = db.get(models.ProjectMetrics, project_id)
+        if metrics is None:
+            metrics = ProjectMetricsService.rebuild(project_id, db)
+        return metrics
+
+    @staticmethod
+    def recent_revision_count(project_id: UUID, db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Revisions in the last REVISION_WINDOW_DAYS, matching
+        calculate_stability_index exactly: whole days come from the buckets,
+        the partial boundary day is counted from the raw table.
+        """
+        now = now or datetime.utcnow()
+        since = now - timedelta(days=REVISION_WINDOW_DAYS)
+        full_days = db.query(func.sum(models.ProjectRevisionBucket.revision_count)).filter(
+            models.ProjectRevisionBucket.project_id == project_id,
+            models.ProjectRevisionBucket.day > since.date()
+        ).scalar() or 0
+        boundary_end = datetime.combine(since.date() + timedelta(days=1), datetime.min.time())
+        boundary = db.query(models.RequirementRevision).join(models.Requirement).filter(
+            models.Requirement.project_id == project_id,
+            models.RequirementRevision.created_at >= since,
+            models.RequirementRevision.created_at < boundary_end
+        ).count()
+        return full_days + boundary
+
+    @staticmethod
+    def summary(project_id: UUID, db: Session) -> Dict[str, Any]:
+        """
+        SAS, RSI and risk from the rollup, using the IntelligenceService formulas.
+        """
+        metrics = ProjectMetricsService.get(project_id, db)
+        n = metrics.requirement_count or 0
+        variance = metrics.sentiment_m2 / (n - 1) if n > 1 else 0.0
+        sas = IntelligenceService.alignment_from_stats(n, variance, metrics.unresolved_severity_sum or 0.0)
+        rsi = IntelligenceService.stability_from_stats(n, ProjectMetricsService.recent_revision_count(project_id, db))
+        return {
+            "alignment_score": sas,
+            "stability_index": rsi,
+            "risk_forecast": IntelligenceService.risk_from_scores(sas, rsi),
+            "requirement_count": n,
+            "open_conflicts": metrics.unresolved_conflict_count or 0
+        }
+
+    # Write-side updates for Core statements, called after the statement ran. Callers pass plain values.
+    @staticmethod
+    def add_requirements(db: Session, project_id: UUID, scores: Iterable[Optional[float]]) -> None:
+        ProjectMetricsService._apply(db, {project_id: _Delta(added=[s or 0.0 for s in scores])}, written=True)
+
+    @staticmethod
+    def replace_scores(db: Session, project_id: UUID, old: Iterable[Optional[float]], new: Iterable[Optional[float]]) -> None:
+        """Sentiment of existing requirements changed from `old` to `new` (bulk UPDATEs)."""
+        delta = _Delta(added=[s or 0.0 for s in new])
+        delta.removed.extend(s or 0.0 for s in old)
+        ProjectMetricsService._apply(db, {project_id: delta}, written=True)
+
+    @staticmethod
+    def add_revisions(db: Session, project_id: UUID, days: Iterable[date]) -> None:
+        delta = _Delta()
+        delta.revision_days.extend(days)
+        ProjectMetricsService._apply(db, {project_id: delta}, written=True)
+
+    @staticmethod
+    def _apply(db: Session, deltas: Dict[UUID, "_Delta"], written: bool = False) -> None:
+        """
+        Fold `deltas` into the projects' rollups. `written` says the rows the
+        deltas describe are already in the database (Core statements) rather
+        than about to be flushed (the ORM hook).
+        """
+        deltas = {pid: d for pid, d in deltas.items() if pid is not None and not d.empty}
+        if not deltas:
+            return
+        with db.no_autoflush:
+            # Row locks (PostgreSQL) keep concurrent ingests from losing each other's deltas
+            rows = {
+                m.project_id: m for m in db.query(models.ProjectMetrics).filter(
+                    models.ProjectMetrics.project_id.in_(list(deltas))
+                ).with_for_update()
+            }
+            # Projects created in this flush are not in the database yet; no
+            # other transaction can read them, so their first read builds the row
+            pending = {obj.id for obj in db.new if isinstance(obj, models.Project)}
+            for project_id in [pid for pid in deltas if pid not in rows]:
+                if project_id in pending:
+                    del deltas[project_id]
+                elif ProjectMetricsService._start_tracking(project_id, db) and written:
+                    # Built from tables that already hold these rows
+                    del deltas[project_id]
+            missing = [pid for pid in deltas if pid not in rows]
+            if missing:
+                rows.update({
+                    m.project_id: m for m in db.query(models.ProjectMetrics).filter(
+                        models.ProjectMetrics.project_id.in_(missing)
+                    ).with_for_update()
+                })
+            for project_id, delta in deltas.items():
+                metrics = rows[project_id]
+                state = (metrics.requirement_count or 0, metrics.sentiment_mean or 0.0, metrics.sentiment_m2 or 0.0)
+                if delta.removed:
+                    state = _subtract(*state, *_batch_stats(delta.removed))
+                if delta.added:
+                    state = _merge(*state, *_batch_stats(delta.added))
+                metrics.requirement_count, metrics.sentiment_mean, metrics.sentiment_m2 = state
+                metrics.unresolved_conflict_count = (metrics.unresolved_conflict_count or 0) + delta.conflicts
+                metrics.unresolved_severity_sum = (metrics.unresolved_severity_sum or 0.0) + delta.severity
+                ProjectMetricsService._bump_buckets(db, project_id, delta.revision_days)
+
+    @staticmethod
+    def _start_tracking(project_id: UUID, db: Session) -> bool:
+        """
+        Insert the project's metrics row, built from the raw tables, unless a
+        concurrent transaction (usually a first read's rebuild()) inserted one
+        first. True if this one did. The other transaction could not see this
+        one's rows, so the caller's delta still applies to its row.
+        """
+        values, buckets = ProjectMetricsService._aggregate(project_id, db)
+        result = db.execute(
+            insert_missing(db, models.ProjectMetrics, ["project_id"]).values(project_id=project_id, **values)
+        )
+        if result.rowcount == 0:
+            return False
+        if buckets:
+            db.execute(insert(models.ProjectRevisionBucket), [
+                {"project_id": project_id, "day": day, "revision_count": n} for day, n in buckets.items()
+            ])
+        return True
+
+    @staticmethod
+    def _bump_buckets(db: Session, project_id: UUID, days: List[date]) -> None:
+        if not days:
+            return
+        counts: Dict[date, int] = defaultdict(int)
+        for day in days:
+            counts[day] += 1
+        existing = {
+            b.day: b for b in db.query(models.ProjectRevisionBucket).filter(
+                models.ProjectRevisionBucket.project_id == project_id,
+                models.ProjectRevisionBucket.day.in_(list(counts))
+            )
+        }
+        for day, n in counts.items():
+            bucket = existing.get(day)
+            if bucket is None:
+                db.add(models.ProjectRevisionBucket(project_id=project_id, day=day, revision_count=n))
+            else:
+                bucket.revision_count += n
+
+
+class _Delta:
+    __slots__ = ("added", "removed", "conflicts", "severity", "revision_days")
+
+    def __init__(self, added=None):
+        self.added: List[float] = added or []
+        self.removed: List[float] = []
+        self.conflicts = 0
+        self.severity = 0.0
+        self.revision_days: List[date] = []
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.conflicts or self.severity or self.revision_days)
+
+
+def _history(session: Session, obj: Any, attr: str) -> Tuple[Any, Any, bool]:
+    """
+    (old, new, changed) for a column attribute of a persistent object.
+    """
+    hist = inspect(obj).attrs[attr].history
+    if not hist.has_changes():
+        value = getattr(obj, attr)
+        return value, value, False
+    new = hist.added[0] if hist.added else None
+    if hist.deleted:
+        return hist.deleted[0], new, True
+    # Set on an expired instance: the old value was never loaded, but the
+    # row has not been written yet, so read it back
+    column = getattr(type(obj), attr)
+    old = session.query(column).filter(type(obj).id == obj.id).scalar()
+    return old, new, True
+
+
+@event.listens_for(Session, "before_flush")
+def _track_project_metrics(session: Session, flush_context, instances) -> None:
+    """
+    Fold ORM writes to requirements, conflicts and revisions into the rollup
+    as part of the same flush. Core bulk inserts bypass this hook and call
+    ProjectMetricsService.add_requirements explicitly.
+    """
+    with session.no_autoflush:
+        _collect_and_apply(session)
+
+
+def _collect_and_apply(session: Session) -> None:
+    deltas: Dict[UUID, _Delta] = defaultdict(_Delta)
+    revisions = []
+
+    for obj in session.new:
+        if isinstance(obj, models.Requirement):
+            deltas[obj.project_id].added.append(obj.sentiment_score or 0.0)
+        elif isinstance(obj, models.Conflict):
+            if not obj.is_resolved:
+                deltas[obj.project_id].conflicts += 1
+                deltas[obj.project_id].severity += _severity(obj.severity_score)
+        elif isinstance(obj, models.RequirementRevision):
+            revisions.append(obj)
+
+    for obj in session.dirty:
+        if isinstance(obj, models.Requirement):
+            old, new, changed = _history(session, obj, "sentiment_score")
+            if changed and (old or 0.0) != (new or 0.0):
+                deltas[obj.project_id].removed.append(old or 0.0)
+                deltas[obj.project_id].added.append(new or 0.0)
+        elif isinstance(obj, models.Conflict):
+            old_resolved, new_resolved, resolved_changed = _history(session, obj, "is_resolved")
+            old_severity, new_severity, severity_changed = _history(session, obj, "severity_score")
+            if not (resolved_changed or severity_changed):
+                continue
+            before = 0.0 if old_resolved else _severity(old_severity)
+            after = 0.0 if new_resolved else _severity(new_severity)
+            deltas[obj.project_id].conflicts += (0 if new_resolved else 1) - (0 if old_resolved else 1)
+            deltas[obj.project_id].severity += after - before
+
+    for obj in session.deleted:
+        if isinstance(obj, models.Requirement):
+            deltas[obj.project_id].removed.append(obj.sentiment_score or 0.0)
+        elif isinstance(obj, models.Conflict) and not obj.is_resolved:
+            deltas[obj.project_id].conflicts -= 1
+            deltas[obj.project_id].severity -= _severity(obj.severity_score)
+
+    if revisions:
+        # Revisions only carry requirement_id; resolve their projects in one query
+        requirement_ids = {r.requirement_id for r in revisions if r.requirement_id is not None}
+        projects = dict(session.query(models.Requirement.id, models.Requirement.project_id).filter(
+            models.Requirement.id.in_(requirement_ids)
+        ).all()) if requirement_ids else {}
+        for revision in revisions:
+            requirement = revision.__dict__.get("requirement")
+            project_id = requirement.project_id if requirement is not None else projects.get(revision.requirement_id)
+            if project_id is not None:
+                deltas[project_id].revision_days.append((revision.created_at or datetime.utcnow()).date())
+
+    ProjectMetricsService._apply(session, deltas)
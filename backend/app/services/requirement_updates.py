@@ -0,0 +1,116 @@
+import logging
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session, joinedload
+
+from app.models import models
+from app.services.embeddings import RequirementIndexService
+from app.services.metrics import ProjectMetricsService
+
+logger = logging.getLogger(__name__)
+
+
+class RequirementUpdateService:
+    """
+    Field updates to any number of requirements in one transaction, with a
+    constant number of statements per batch:
+
+    - one SELECT (FOR UPDATE on PostgreSQL) loads every target row;
+    - one executemany UPDATE per distinct set of changed columns;
+    - one bulk INSERT writes every revision;
+    - the project metrics are updated once per project;
+    - one SELECT reloads the rows for the response, instead of a refresh() each.
+    """
+
+    @staticmethod
+    def apply(
+        updates: Dict[UUID, Dict[str, Any]],
+        db: Session,
+        changed_by: Optional[UUID] = None
+    ) -> List[models.Requirement]:
+        """
+        Apply {requirement id: {field: new value}} and return the requirements
+        in the order given. Raises LookupError (args: the missing ids) before
+        writing anything if a requirement does not exist.
+        """
+        ids = list(updates)
+        # Locked in id order, so overlapping batches cannot deadlock each other
+        requirements = {
+            r.id: r for r in db.query(models.Requirement).filter(
+                models.Requirement.id.in_(ids)
+            ).order_by(models.Requirement.id).with_for_update()
+        }
+        missing = [requirement_id for requirement_id in ids if requirement_id not in requirements]
+        if missing:
+            raise LookupError(*missing)
+
+        changed_at = datetime.utcnow()
+        changes = []
+        revisions = []
+        revision_days: Dict[UUID, List[date]] = defaultdict(list)
+        # project -> (old scores, new scores) for requirements whose sentiment changed
+        sentiment_changes: Dict[UUID, Tuple[List[Optional[float]], List[Optional[float]]]] = defaultdict(lambda: ([], []))
+        reindexed = []
+        for requirement_id, fields in updates.items():
+            requirement = requirements[requirement_id]
+            changed = {}
+            for field, value in fields.items():
+                old_value = getattr(requirement, field)
+                if old_value == value:
+                    continue
+                revisions.append({
+                    "requirement_id": requirement_id,
+                    "field_changed": field,
+                    "old_value": str(old_value),
+                    "new_value": str(value),
+                    "changed_by": changed_by,
+                    "created_at": changed_at
+                })
+                revision_days[requirement.project_id].append(changed_at.date())
+                changed[field] = value
+            if changed:
+                changes.append({"id": requirement_id, **changed})
+            if "text" in changed:
+                reindexed.append(requirement_id)
+            if "sentiment_score" in changed:
+                old_scores, new_scores = sentiment_changes[requirement.project_id]
+                old_scores.append(requirement.sentiment_score)
+                new_scores.append(changed["sentiment_score"])
+
+        if changes:
+            # Bulk UPDATE by primary key; rows with the same changed columns are
+            # adjacent, so each column set goes out as a single executemany
+            changes.sort(key=lambda row: sorted(row))
+            db.execute(update(models.Requirement), changes)
+            db.execute(insert(models.RequirementRevision), revisions)
+            # Bulk UPDATE and Core inserts skip the ORM flush hook, so update the rollup here
+            for project_id, (old_scores, new_scores) in sentiment_changes.items():
+                ProjectMetricsService.replace_scores(db, project_id, old_scores, new_scores)
+            for project_id, days in revision_days.items():
+                ProjectMetricsService.add_revisions(db, project_id, days)
+        db.commit()
+
+        # Reload everything the response needs in one query (commit expired the rows)
+        reloaded = {
+            r.id: r for r in db.query(models.Requirement).options(
+                joinedload(models.Requirement.stakeholder)
+            ).filter(models.Requirement.id.in_(ids))
+        }
+        if reindexed:
+            # The update is already committed, so a failed re-embed must not turn
+            # it into an error: drop the stale vectors and let the next sync()
+            # embed the new text
+            edited = [reloaded[requirement_id] for requirement_id in reindexed]
+            try:
+                RequirementIndexService.reindex_requirements(edited)
+            except Exception:
+                logger.exception(f"Re-indexing {len(edited)} updated requirements failed; deferring to the next sync")
+                try:
+                    RequirementIndexService.invalidate(edited)
+                except Exception:
+                    logger.exception("Dropping the stale requirement vectors failed")
+        return [reloaded[requirement_id] for requirement_id in ids]
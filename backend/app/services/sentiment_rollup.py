@@ -0,0 +1,184 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import bindparam, func, insert, update
+from sqlalchemy.orm import Session
+
+from app.models import models
+
+GRANULARITIES = ("hour", "day")
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class SentimentRollupService:
+    """
+    Hourly and daily sentiment rollups per (project, channel, stakeholder).
+
+    Each SentimentPulse written at ingest is folded into one hour row and one
+    day row (count, sum, sum of squares), so trend queries read a handful of
+    bucket rows instead of scanning sentiment_pulses. Rows are additive: two
+    rows for the same key (e.g. from concurrent ingests) simply sum together
+    at query time.
+    """
+
+    @staticmethod
+    def record(db: Session, pulses: Iterable[Dict[str, Any]]) -> None:
+        """
+        Fold pulse rows ({project_id, stakeholder_id, score, source_type,
+        created_at}) into the rollup. Runs in the caller's transaction.
+        """
+        deltas: Dict[Tuple, List[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+        for pulse in pulses:
+            created_at = pulse.get("created_at") or datetime.utcnow()
+            score = pulse.get("score") or 0.0
+            for granularity in GRANULARITIES:
+                key = (
+                    pulse["project_id"], granularity, bucket_start(created_at, granularity),
+                    pulse.get("source_type"), pulse.get("stakeholder_id")
+                )
+                delta = deltas[key]
+                delta[0] += 1
+                delta[1] += score
+                delta[2] += score * score
+        if not deltas:
+            return
+
+        # One read for every bucket touched, then one executemany UPDATE and a
+        # single bulk insert. Increments are applied in SQL (col = col + delta),
+        # so concurrent ingests folding into the same row never lose counts.
+        rollups = models.SentimentRollup.__table__
+        existing = {}
+        for project_id in {key[0] for key in deltas}:
+            starts = {key[2] for key in deltas if key[0] == project_id}
+            for row in db.query(
+                rollups.c.id, rollups.c.project_id, rollups.c.granularity,
+                rollups.c.bucket_start, rollups.c.source_type, rollups.c.stakeholder_id
+            ).filter(
+                rollups.c.project_id == project_id,
+                rollups.c.bucket_start.in_(starts)
+            ):
+                existing.setdefault(
+                    (row.project_id, row.granularity, row.bucket_start, row.source_type, row.stakeholder_id), row.id
+                )
+
+        increments = []
+        new_rows = []
+        for key, (count, total, total_sq) in deltas.items():
+            row_id = existing.get(key)
+            if row_id is not None:
+                increments.append({"row_id": row_id, "add_count": count, "add_sum": total, "add_sumsq": total_sq})
+            else:
+                project_id, granularity, start, source_type, stakeholder_id = key
+                new_rows.append({
+                    "project_id": project_id,
+                    "granularity": granularity,
+                    "bucket_start": start,
+                    "source_type": source_type,
+                    "stakeholder_id": stakeholder_id,
+                    "pulse_count": count,
+                    "score_sum": total,
+                    "score_sumsq": total_sq
+                })
+        if increments:
+            db.execute(update(rollups).where(rollups.c.id == bindparam("row_id")).values(
+                pulse_count=func.coalesce(rollups.c.pulse_count, 0) + bindparam("add_count"),
+                score_sum=func.coalesce(rollups.c.score_sum, 0.0) + bindparam("add_sum"),
+                score_sumsq=func.coalesce(rollups.c.score_sumsq, 0.0) + bindparam("add_sumsq")
+            ), increments)
+        if new_rows:
+            db.execute(insert(models.SentimentRollup).execution_options(render_nulls=True), new_rows)
+
+    @staticmethod
+    def rebuild(project_id: UUID, db: Session) -> int:
+        """
+        Recompute a project's rollup from sentiment_pulses (backfill / repair).
+        Returns the number of pulses folded in.
+        """
+        db.query(models.SentimentRollup).filter(
+            models.SentimentRollup.project_id == project_id
+        ).delete(synchronize_session=False)
+        pulses = db.query(
+            models.SentimentPulse.project_id,
+            models.SentimentPulse.stakeholder_id,
+            models.SentimentPulse.score,
+            models.SentimentPulse.source_type,
+            models.SentimentPulse.created_at
+        ).filter(models.SentimentPulse.project_id == project_id).yield_per(5000)
+        count = 0
+        batch = []
+        for pulse in pulses:
+            batch.append(pulse._asdict())
+            count += 1
+            if len(batch) >= 5000:
+                SentimentRollupService.record(db, batch)
+                db.flush()
+                batch = []
+        SentimentRollupService.record(db, batch)
+        db.commit()
+        return count
+
+    @staticmethod
+    def trend(
+        project_id: UUID,
+        db: Session,
+        bucket: str = "day",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        group_by: str = "none",
+        source_type: Optional[str] = None,
+        stakeholder_id: Optional[UUID] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Average sentiment per bucket in [start, end), optionally split by
+        channel or stakeholder and filtered to one of them.
+        """
+        end = end or datetime.utcnow()
+        # Default window: the current bucket plus the 47 hours / 6 days before it
+        start = start or bucket_start(end, bucket) - (timedelta(hours=47) if bucket == "hour" else timedelta(days=6))
+        split = {
+            "channel": models.SentimentRollup.source_type,
+            "stakeholder": models.SentimentRollup.stakeholder_id
+        }.get(group_by)
+
+        columns = [
+            models.SentimentRollup.bucket_start,
+            func.sum(models.SentimentRollup.pulse_count),
+            func.sum(models.SentimentRollup.score_sum),
+            func.sum(models.SentimentRollup.score_sumsq)
+        ]
+        query = db.query(*columns, *([split] if split is not None else [])).filter(
+            models.SentimentRollup.project_id == project_id,
+            models.SentimentRollup.granularity == bucket,
+            models.SentimentRollup.bucket_start >= bucket_start(start, bucket),
+            models.SentimentRollup.bucket_start < end
+        )
+        if source_type is not None:
+            query = query.filter(models.SentimentRollup.source_type == source_type)
+        if stakeholder_id is not None:
+            query = query.filter(models.SentimentRollup.stakeholder_id == stakeholder_id)
+        group = [models.SentimentRollup.bucket_start] + ([split] if split is not None else [])
+        rows = query.group_by(*group).order_by(*group).all()
+
+        points = []
+        for row in rows:
+            start_at, count, total, total_sq = row[:4]
+            mean = total / count if count else 0.0
+            point = {
+                "bucket_start": start_at.isoformat(),
+                "count": count,
+                "avg_score": round(mean, 4),
+                "stddev": round(max(total_sq / count - mean * mean, 0.0) ** 0.5, 4) if count else 0.0
+            }
+            if group_by == "channel":
+                point["channel"] = row[4]
+            elif group_by == "stakeholder":
+                point["stakeholder_id"] = str(row[4]) if row[4] is not None else None
+            points.append(point)
+        return points
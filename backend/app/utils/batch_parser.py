@@ -0,0 +1,82 @@
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional
+
+from app.core.config import settings
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def worker_count() -> int:
+    return settings.PARSE_WORKERS or os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Shared worker pool for CPU-bound parsing, created on first use.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=worker_count())
+    return _pool
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def parse_in_batches(
+    items: Iterable[Any],
+    parse_batch: Callable[[List[Any]], List[str]],
+    chunk_size: Optional[int] = None,
+    executor: Optional[ProcessPoolExecutor] = None,
+    max_in_flight: Optional[int] = None
+) -> AsyncIterator[str]:
+    """
+    Run `parse_batch` over `items` in chunks on a process pool and stream the
+    parsed texts back in input order. `parse_batch` must be picklable (a
+    module-level function or staticmethod). At most two chunks per worker are
+    in flight, so memory stays bounded even for generator inputs.
+
+    Inputs that fit in a single chunk are parsed on a thread instead, which
+    skips the pickling round-trip but still keeps the event loop free.
+    Chunks are also pulled from `items` on a thread: advancing a lazy source
+    (e.g. an EmailStream reading CSV chunks from disk) is blocking work too.
+    """
+    loop = asyncio.get_running_loop()
+    chunk_size = chunk_size or settings.PARSE_CHUNK_SIZE
+    chunks = iter(lambda it=iter(items): list(islice(it, chunk_size)), [])
+
+    def next_chunk():
+        return loop.run_in_executor(None, next, chunks, None)
+
+    first = await next_chunk()
+    if first is None:
+        return
+    second = await next_chunk()
+    if second is None:
+        for text in await loop.run_in_executor(None, parse_batch, first):
+            yield text
+        return
+
+    pool = executor or get_process_pool()
+    max_in_flight = max_in_flight or 2 * worker_count()
+    pending = deque([
+        loop.run_in_executor(pool, parse_batch, first),
+        loop.run_in_executor(pool, parse_batch, second)
+    ])
+    while (chunk := await next_chunk()) is not None:
+        # Keep the pool busy but bounded; results are yielded in submission order
+        while len(pending) >= max_in_flight:
+            for text in await pending.popleft():
+                yield text
+        pending.append(loop.run_in_executor(pool, parse_batch, chunk))
+    while pending:
+        for text in await pending.popleft():
+            yield text
@@ -6,6 +6,8 @@ class NoiseFilter:
     Advanced noise filtering for business communication (emails, transcripts).
     """
     
+    _compiled: Optional[tuple] = None
+
     # Generic corporate/personal noise patterns
     NOISE_PATTERNS = [
         r"(?i)lunch",
@@ -50,28 +52,51 @@ class NoiseFilter:
         r"(?i)scope"
     ]
 
+    # The only non-ASCII letters that (?i) folds onto ASCII ones once text is lowercased
+    _CASE_FOLDS = str.maketrans({"\u0131": "i", "\u017f": "s"})
+
+    @staticmethod
+    def _compile(patterns: List[str]) -> "re.Pattern":
+        """
+        Fold a pattern list into a single alternation regex. The patterns are
+        lowercase and only ever run on lowercased text, so the (?i) flag (which
+        disables CPython's fast literal scanning) is dropped.
+        """
+        return re.compile("|".join(p[4:] if p.startswith("(?i)") else p for p in patterns))
+
+    @classmethod
+    def _matchers(cls):
+        if cls._compiled is None:
+            cls._compiled = (cls._compile(cls.SIGNAL_PATTERNS), cls._compile(cls.NOISE_PATTERNS))
+        return cls._compiled
+
     @classmethod
     def is_noise(cls, text: str) -> bool:
         """
         Returns True if the text is primarily noise.
         """
-        text_lower = text.lower()
-        
         # 1. If it's too short, it's likely noise or fluff
         if len(text.strip()) < 30:
             return True
-            
+
+        text_lower = text.lower()
+        if not text_lower.isascii():
+            text_lower = text_lower.translate(cls._CASE_FOLDS)
+        signal_re, noise_re = cls._matchers()
+
         # 2. Check for high-value signals first
-        if any(re.search(pattern, text_lower) for pattern in cls.SIGNAL_PATTERNS):
+        if signal_re.search(text_lower):
             return False
-            
-        # 3. Check for heavy noise patterns
-        # If text contains more noise words than non-noise words, or direct noise match
-        noise_matches = sum(1 for pattern in cls.NOISE_PATTERNS if re.search(pattern, text_lower))
-        if noise_matches >= 1:
-            return True
-            
-        return False
+
+        # 3. Check for heavy noise patterns (any direct noise match)
+        return noise_re.search(text_lower) is not None
+
+    @classmethod
+    def filter_batch(cls, texts: List[str]) -> List[str]:
+        """
+        Returns the texts that are not noise, in their original order.
+        """
+        return [text for text in texts if not cls.is_noise(text)]
 
     @classmethod
     def clean_text(cls, text: str) -> str:
@@ -0,0 +1,211 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18
+
+The schema as Base.metadata.create_all built it before migrations existed.
+Tables and indexes that already exist are skipped, so databases created by
+create_all (at any earlier point) are adopted with a plain `alembic upgrade head`.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _existing():
+    if context.is_offline_mode():
+        return set(), set()
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    indexes = {index['name'] for table in tables for index in inspector.get_indexes(table)}
+    return tables, indexes
+
+
+def upgrade() -> None:
+    tables, indexes = _existing()
+
+    def create_table(name, *columns):
+        if name not in tables:
+            op.create_table(name, *columns)
+
+    def create_index(name, table, columns, unique):
+        if name not in indexes:
+            op.create_index(name, table, columns, unique=unique)
+
+    create_table('users',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index('ix_users_email', 'users', ['email'], unique=True)
+    create_table('integration_tokens',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('provider', sa.String(), nullable=False),
+    sa.Column('access_token', sa.Text(), nullable=False),
+    sa.Column('refresh_token', sa.Text(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('projects',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('owner_id', sa.UUID(), nullable=True),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('conflict_watermarks',
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    sa.Column('last_created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+    create_table('ingestion_jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('project_id', sa.UUID(), nullable=True),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('channel_type', sa.String(), nullable=False),
+    sa.Column('config', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('stage', sa.String(), nullable=True),
+    sa.Column('progress', sa.Float(), nullable=True),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('cancel_requested', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('project_metrics',
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    sa.Column('requirement_count', sa.Integer(), nullable=True),
+    sa.Column('sentiment_mean', sa.Float(), nullable=True),
+    sa.Column('sentiment_m2', sa.Float(), nullable=True),
+    sa.Column('unresolved_conflict_count', sa.Integer(), nullable=True),
+    sa.Column('unresolved_severity_sum', sa.Float(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+    create_table('project_revision_buckets',
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('revision_count', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('project_id', 'day')
+    )
+    create_table('stakeholders',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('project_id', sa.UUID(), nullable=True),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('role', sa.String(), nullable=True),
+    sa.Column('influence_score', sa.Float(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('requirements',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('project_id', sa.UUID(), nullable=True),
+    sa.Column('stakeholder_id', sa.UUID(), nullable=True),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('source_type', sa.String(), nullable=True),
+    sa.Column('source_ref', sa.String(), nullable=True),
+    sa.Column('category', sa.String(), nullable=True),
+    sa.Column('priority_score', sa.Float(), nullable=True),
+    sa.Column('sentiment_score', sa.Float(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['stakeholder_id'], ['stakeholders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('sentiment_pulses',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('project_id', sa.UUID(), nullable=True),
+    sa.Column('stakeholder_id', sa.UUID(), nullable=True),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('comment_snippet', sa.Text(), nullable=True),
+    sa.Column('source_type', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['stakeholder_id'], ['stakeholders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('sentiment_rollups',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    sa.Column('granularity', sa.String(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('source_type', sa.String(), nullable=True),
+    sa.Column('stakeholder_id', sa.UUID(), nullable=True),
+    sa.Column('pulse_count', sa.Integer(), nullable=True),
+    sa.Column('score_sum', sa.Float(), nullable=True),
+    sa.Column('score_sumsq', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['stakeholder_id'], ['stakeholders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_index('ix_sentiment_rollups_lookup', 'sentiment_rollups', ['project_id', 'granularity', 'bucket_start'], unique=False)
+    create_table('conflicts',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('project_id', sa.UUID(), nullable=True),
+    sa.Column('req_a_id', sa.UUID(), nullable=True),
+    sa.Column('req_b_id', sa.UUID(), nullable=True),
+    sa.Column('conflict_type', sa.String(), nullable=True),
+    sa.Column('severity_score', sa.Float(), nullable=True),
+    sa.Column('resolution_summary', sa.Text(), nullable=True),
+    sa.Column('is_resolved', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['req_a_id'], ['requirements.id'], ),
+    sa.ForeignKeyConstraint(['req_b_id'], ['requirements.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    create_table('requirement_revisions',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('requirement_id', sa.UUID(), nullable=True),
+    sa.Column('field_changed', sa.String(), nullable=True),
+    sa.Column('old_value', sa.Text(), nullable=True),
+    sa.Column('new_value', sa.Text(), nullable=True),
+    sa.Column('changed_by', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['changed_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['requirement_id'], ['requirements.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('requirement_revisions')
+    op.drop_table('conflicts')
+    op.drop_index('ix_sentiment_rollups_lookup', table_name='sentiment_rollups')
+    op.drop_table('sentiment_rollups')
+    op.drop_table('sentiment_pulses')
+    op.drop_table('requirements')
+    op.drop_table('stakeholders')
+    op.drop_table('project_revision_buckets')
+    op.drop_table('project_metrics')
+    op.drop_table('ingestion_jobs')
+    op.drop_table('conflict_watermarks')
+    op.drop_table('projects')
+    op.drop_table('integration_tokens')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
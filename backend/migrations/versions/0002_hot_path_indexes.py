@@ -0,0 +1,87 @@
+"""hot path indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Composite indexes for the filters every request path uses, plus a unique
+(project_id, name) constraint on stakeholders. Duplicate stakeholders left
+by earlier ingests are merged into the oldest-id row first, so the
+constraint can be created on existing data. Indexes and the constraint that
+already exist (databases built by create_all from the current models) are
+skipped, as in 0001.
+"""
+from collections import defaultdict
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_projects_owner_id', 'projects', ['owner_id']),
+    ('ix_requirements_project_created', 'requirements', ['project_id', 'created_at']),
+    ('ix_sentiment_pulses_project_created', 'sentiment_pulses', ['project_id', 'created_at']),
+    ('ix_requirement_revisions_requirement_created', 'requirement_revisions', ['requirement_id', 'created_at']),
+    ('ix_integration_tokens_user_provider', 'integration_tokens', ['user_id', 'provider']),
+    ('ix_conflicts_project_resolved', 'conflicts', ['project_id', 'is_resolved']),
+]
+
+# Tables whose stakeholder_id must follow a merged stakeholder
+STAKEHOLDER_REFERENCES = ['requirements', 'sentiment_pulses', 'sentiment_rollups']
+
+
+def merge_duplicate_stakeholders(bind) -> None:
+    stakeholders = sa.table('stakeholders', sa.column('id'), sa.column('project_id'), sa.column('name'))
+    groups = defaultdict(list)
+    for row in bind.execute(
+        sa.select(stakeholders.c.id, stakeholders.c.project_id, stakeholders.c.name).order_by(stakeholders.c.id)
+    ):
+        groups[row.project_id, row.name].append(row.id)
+
+    for ids in groups.values():
+        if len(ids) < 2:
+            continue
+        keep, duplicates = ids[0], ids[1:]
+        for table_name in STAKEHOLDER_REFERENCES:
+            table = sa.table(table_name, sa.column('stakeholder_id'))
+            bind.execute(
+                table.update().where(table.c.stakeholder_id.in_(duplicates)).values(stakeholder_id=keep)
+            )
+        bind.execute(stakeholders.delete().where(stakeholders.c.id.in_(duplicates)))
+
+
+def _existing():
+    if context.is_offline_mode():
+        return set(), set()
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    indexes = {index['name'] for table in tables for index in inspector.get_indexes(table)}
+    constraints = {constraint['name'] for constraint in inspector.get_unique_constraints('stakeholders')}
+    return indexes, constraints
+
+
+def upgrade() -> None:
+    indexes, constraints = _existing()
+    for name, table, columns in INDEXES:
+        if name not in indexes:
+            op.create_index(name, table, columns, unique=False)
+
+    if 'uq_stakeholders_project_name' in constraints:
+        return
+    if not context.is_offline_mode():
+        # Needs to read rows, so an offline (--sql) script assumes no duplicates
+        merge_duplicate_stakeholders(op.get_bind())
+    with op.batch_alter_table('stakeholders', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_stakeholders_project_name', ['project_id', 'name'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('stakeholders', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_stakeholders_project_name', type_='unique')
+
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
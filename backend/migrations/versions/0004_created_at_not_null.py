@@ -0,0 +1,54 @@
+"""created_at not null on keyset-paged tables
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+The requirement and conflict listings page on (created_at, id). A NULL
+created_at matches no cursor comparison, so the row is skipped, or it ends
+a page and its cursor cannot be encoded. Existing NULLs take their
+project's created_at (or the migration time) before the column becomes
+NOT NULL.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+# UUID columns per table and what they reference. SQLite reflects UUID as
+# NUMERIC, so the batch rebuild there is given the declared columns instead
+TABLES = {
+    'requirements': {'id': None, 'project_id': 'projects.id', 'stakeholder_id': 'stakeholders.id'},
+    'conflicts': {'id': None, 'project_id': 'projects.id', 'req_a_id': 'requirements.id', 'req_b_id': 'requirements.id'},
+}
+
+
+def _batch(table_name):
+    columns = [
+        sa.Column(name, sa.UUID(), primary_key=True) if target is None else sa.Column(name, sa.UUID(), sa.ForeignKey(target))
+        for name, target in TABLES[table_name].items()
+    ]
+    return op.batch_alter_table(table_name, schema=None, reflect_args=columns)
+
+
+def upgrade() -> None:
+    projects = sa.table('projects', sa.column('id'), sa.column('created_at'))
+    for table_name in TABLES:
+        table = sa.table(table_name, sa.column('project_id'), sa.column('created_at'))
+        project_created = sa.select(projects.c.created_at).where(projects.c.id == table.c.project_id).scalar_subquery()
+        op.execute(
+            table.update().where(table.c.created_at.is_(None)).values(
+                created_at=sa.func.coalesce(project_created, sa.func.current_timestamp())
+            )
+        )
+        with _batch(table_name) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    for table_name in reversed(list(TABLES)):
+        with _batch(table_name) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
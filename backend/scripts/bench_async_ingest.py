@@ -0,0 +1,140 @@
+"""
+Does a running ingest stall unrelated requests on the same event loop?
+
+Runs several channel ingests (Slack mock data, LLM extraction simulated with
+an awaited delay so the run is offline and repeatable) while a probe keeps
+calling GET /health through the ASGI app on the same loop. A second
+connection periodically holds the SQLite write lock, as another worker or
+process would, so each ingest has to wait for the database.
+
+With a plain Session that wait happens inside the event loop and every
+request queued behind it stalls; with an AsyncSession (the path the API and
+the job workers now use) the wait is awaited and the probe keeps flowing.
+
+    python scripts/bench_async_ingest.py
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base, create_async_db_engine, create_db_engine
+from app.main import app
+from app.models import models
+from app.services.ai_pipeline import ai_processor
+from app.services.ingestion import IngestionService
+
+
+def hold_write_lock(path: str, stop: threading.Event, hold: float, gap: float) -> None:
+    connection = sqlite3.connect(path, isolation_level=None, timeout=30)
+    while not stop.is_set():
+        connection.execute("BEGIN IMMEDIATE")
+        time.sleep(hold)
+        connection.execute("COMMIT")
+        time.sleep(gap)
+    connection.close()
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list, interval: float = 0.01) -> None:
+    # Latency counts from when each request was due, so time the loop spent
+    # blocked before it could even send the request is included
+    due = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        await client.get("/health")
+        latencies.append(time.perf_counter() - due)
+        due = max(due + interval, time.perf_counter() - interval)
+
+
+async def run(mode: str, path: str, project_ids, ingests: int, requirements: int, llm_latency: float):
+    url = f"sqlite:///{path}"
+    if mode == "sync":
+        factory = sessionmaker(bind=create_db_engine(url), autoflush=False)
+    else:
+        engine = create_async_db_engine(url)
+        factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async def extract(texts):
+        await asyncio.sleep(llm_latency)
+        return [{
+            "text": f"Requirement {i} from {texts[0][:20]}", "category": "functional",
+            "priority_score": 0.5, "sentiment_score": 0.1, "stakeholder_name": f"person-{i % 7}"
+        } for i in range(requirements)]
+
+    async def ingest(project_id):
+        db = factory()
+        try:
+            await IngestionService.ingest_from_channel(project_id, "slack", {}, db)
+        finally:
+            if mode == "sync":
+                db.close()
+            else:
+                await db.close()
+
+    latencies: list = []
+    stop = asyncio.Event()
+    original = ai_processor.extract_requirements_chunked
+    ai_processor.extract_requirements_chunked = extract
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            prober = asyncio.create_task(probe(client, stop, latencies))
+            start = time.perf_counter()
+            await asyncio.gather(*(ingest(project_ids[i % len(project_ids)]) for i in range(ingests)))
+            elapsed = time.perf_counter() - start
+            stop.set()
+            await prober
+    finally:
+        ai_processor.extract_requirements_chunked = original
+        if mode == "async":
+            await engine.dispose()
+    return elapsed, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ingests", type=int, default=8)
+    parser.add_argument("--requirements", type=int, default=200, help="requirements per ingest")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="simulated extraction seconds")
+    parser.add_argument("--lock-hold", type=float, default=0.3, help="seconds the competing writer holds the lock")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        engine = create_db_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as db:
+            projects = [models.Project(name=f"bench-{i}") for i in range(4)]
+            db.add_all(projects)
+            db.commit()
+            project_ids = [p.id for p in projects]
+        engine.dispose()
+
+        stop = threading.Event()
+        locker = threading.Thread(target=hold_write_lock, args=(path, stop, args.lock_hold, 0.2), daemon=True)
+        locker.start()
+        try:
+            print(f"{args.ingests} ingests x {args.requirements} requirements, {args.llm_latency:.1f}s simulated LLM, "
+                  f"competing writer holds the lock {args.lock_hold:.1f}s at a time")
+            for mode, label in (("sync", "Session (blocking)"), ("async", "AsyncSession")):
+                elapsed, latencies = asyncio.run(run(mode, path, project_ids, args.ingests, args.requirements, args.llm_latency))
+                p95 = latencies[int(0.95 * (len(latencies) - 1))]
+                print(f"  {label:19} ingests done in {elapsed:5.2f}s | /health x{len(latencies):4}: "
+                      f"p50 {statistics.median(latencies) * 1000:6.1f}ms  p95 {p95 * 1000:6.1f}ms  max {latencies[-1] * 1000:6.1f}ms")
+        finally:
+            stop.set()
+            locker.join()
+
+
+if __name__ == "__main__":
+    main()
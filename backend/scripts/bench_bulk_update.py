@@ -0,0 +1,85 @@
+"""
+Backlog grooming: N requirement edits as N PUT /requirements/{id} requests
+against one PATCH /requirements/bulk. Reports wall time and the SQL
+statements each path sends.
+
+    python scripts/bench_bulk_update.py --edits 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.session import Base, create_db_engine, get_db
+from app.main import app
+from app.models import models
+from app.services.metrics import ProjectMetricsService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--edits", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings.VECTOR_INDEX_DIR = os.path.join(directory, "vector_index")
+        engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'grooming.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        with Session() as db:
+            project = models.Project(name="grooming")
+            db.add(project)
+            db.flush()
+            requirements = [
+                models.Requirement(project_id=project.id, text=f"The system must handle case {i}", status="extracted")
+                for i in range(args.edits * 2)
+            ]
+            db.add_all(requirements)
+            db.commit()
+            ProjectMetricsService.rebuild(project.id, db)
+            ids = [str(r.id) for r in requirements]
+
+        def override():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override
+        client = TestClient(app)
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(1))
+
+        def edit(i):
+            return {"status": "approved", "priority_score": float(i % 10), "text": f"The system must handle case {i} (groomed)"}
+
+        start = time.perf_counter()
+        for i, requirement_id in enumerate(ids[:args.edits]):
+            client.put(f"/api/v1/requirements/{requirement_id}", json=edit(i)).raise_for_status()
+        single = time.perf_counter() - start, len(statements)
+
+        statements.clear()
+        start = time.perf_counter()
+        client.patch("/api/v1/requirements/bulk", json={
+            "updates": [{"id": requirement_id, **edit(i)} for i, requirement_id in enumerate(ids[args.edits:])]
+        }).raise_for_status()
+        bulk = time.perf_counter() - start, len(statements)
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+    print(f"{args.edits} edits (status, priority and text each)")
+    for label, (elapsed, count) in (("PUT per requirement", single), ("PATCH /requirements/bulk", bulk)):
+        print(f"  {label:25} {elapsed:6.2f}s  {count:6} statements")
+
+
+if __name__ == "__main__":
+    main()
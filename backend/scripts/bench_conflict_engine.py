@@ -0,0 +1,78 @@
+import random
+import sys
+import time
+import os
+from types import SimpleNamespace
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.conflict_engine import ConflictEngine
+
+CATEGORIES = ["functional", "non-functional", "constraint", None]
+FRAGMENTS = [
+    "The system must support SSO for enterprise tenants",
+    "Reports should be exported as PDF",
+    "Latency must stay under 200ms at peak",
+    "Launch the mobile app before the trade show",
+    "Users can upload attachments up to 25MB",
+    "Audit logs are retained for 7 years",
+    "Budget is capped for the pilot phase",
+    "Notifications are batched hourly",
+]
+
+
+def make_requirements(n: int, seed: int = 7, term_rate: float = 0.002):
+    rng = random.Random(seed)
+    reqs = []
+    for i in range(n):
+        # Mostly rule-free text with a sprinkle of rule terms, like a real backlog
+        text = f"{rng.choice(FRAGMENTS)} (ticket {i})"
+        roll = rng.random()
+        if roll < term_rate:
+            text += " within the next month"
+        elif roll < 2 * term_rate:
+            text += "; applies to all tenants"
+        elif roll < 3 * term_rate:
+            text += ", except for internal users"
+        reqs.append(SimpleNamespace(id=i, text=text, category=rng.choice(CATEGORIES)))
+    return reqs
+
+
+def legacy_detect(requirements):
+    """The original pairwise scan from IntelligenceService.detect_conflicts."""
+    found = []
+    for i in range(len(requirements)):
+        for j in range(i + 1, len(requirements)):
+            req_a = requirements[i]
+            req_b = requirements[j]
+            low_a = req_a.text.lower()
+            low_b = req_b.text.lower()
+            if req_a.category == req_b.category and req_a.category is not None:
+                if "month" in low_a and "month" in low_b:
+                    found.append((req_a.id, req_b.id, "timeline", 0.85))
+                elif "all" in low_a and "except" in low_b:
+                    found.append((req_a.id, req_b.id, "scope", 0.7))
+    return found
+
+
+def run():
+    engine = ConflictEngine()
+
+    # 1. Equivalence against the legacy quadratic loop on a small corpus
+    sample = make_requirements(1500, seed=1, term_rate=0.05)
+    expected = legacy_detect(sample)
+    actual = [(a.id, b.id, r.conflict_type, r.severity) for a, b, r in engine.find_conflicts(sample)]
+    assert actual == expected, "Indexed engine diverged from the pairwise scan"
+    print(f"✅ Equivalent on {len(sample)} requirements ({len(expected)} conflicts)")
+
+    # 2. Throughput at scale
+    for n in (20_000, 50_000):
+        reqs = make_requirements(n)
+        start = time.perf_counter()
+        conflicts = engine.find_conflicts(reqs)
+        elapsed = time.perf_counter() - start
+        print(f"⏱️  {n:>6} requirements -> {len(conflicts):>8} conflicts in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,111 @@
+"""
+Project export: streamed with ExportService against building the whole
+body in memory first, as a non-streaming export would. Reports time to the
+first chunk, total time and peak Python memory.
+
+    python scripts/bench_export.py --requirements 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.db.session import Base, create_db_engine
+from app.models import models
+from app.schemas import schemas
+from app.services.export import ExportService
+
+
+def seed(engine, requirements):
+    project_id, now = uuid4(), datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(insert(models.Project), [{"id": project_id, "name": "export"}])
+        batch = []
+        for i in range(requirements):
+            batch.append({
+                "id": uuid4(), "project_id": project_id, "text": f"The system must support workflow {i}",
+                "source_type": "slack", "category": "functional", "priority_score": 0.5,
+                "sentiment_score": 0.0, "status": "extracted", "created_at": now + timedelta(milliseconds=i)
+            })
+            if len(batch) == 50_000 or i == requirements - 1:
+                connection.execute(insert(models.Requirement), batch)
+                ids = [row["id"] for row in batch]
+                connection.execute(insert(models.Conflict), [{
+                    "id": uuid4(), "project_id": project_id, "req_a_id": ids[j], "req_b_id": ids[j + 1],
+                    "conflict_type": "logic", "severity_score": 0.5, "is_resolved": False
+                } for j in range(0, len(ids) - 1, 20)])
+                connection.execute(insert(models.RequirementRevision), [{
+                    "id": uuid4(), "requirement_id": ids[j], "field_changed": "text", "old_value": "a", "new_value": "b"
+                } for j in range(0, len(ids), 5)])
+                batch = []
+    return project_id
+
+
+def streamed(engine, project):
+    def run():
+        first = None
+        size = 0
+        start = time.perf_counter()
+        with Session(bind=engine) as db:
+            for chunk in ExportService.stream_ndjson(project, db):
+                first = first or time.perf_counter() - start
+                size += len(chunk)
+        return first, size
+    return run
+
+
+def in_memory(engine, project):
+    def run():
+        start = time.perf_counter()
+        with Session(bind=engine) as db:
+            requirements = db.query(models.Requirement).filter(models.Requirement.project_id == project.id).all()
+            conflicts = db.query(models.Conflict).filter(models.Conflict.project_id == project.id).all()
+            revisions = db.query(models.RequirementRevision).join(models.Requirement).filter(
+                models.Requirement.project_id == project.id).all()
+            lines = [schemas.Requirement.model_validate(r).model_dump_json() for r in requirements]
+            lines += [json.dumps({"id": str(c.id), "req_a": c.req_a.text, "req_b": c.req_b.text}) for c in conflicts]
+            lines += [json.dumps({"id": str(r.id), "new_value": r.new_value}) for r in revisions]
+            body = ("\n".join(lines) + "\n").encode()
+        return time.perf_counter() - start, len(body)
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requirements", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'export.db')}")
+        Base.metadata.create_all(bind=engine)
+        project_id = seed(engine, args.requirements)
+        with Session(bind=engine, expire_on_commit=False) as db:
+            project = db.get(models.Project, project_id)
+
+        print(f"{args.requirements:,} requirements, {args.requirements // 20:,} conflicts, {args.requirements // 5:,} revisions")
+        for label, run in (("in memory, then sent", in_memory(engine, project)), ("streamed (ExportService)", streamed(engine, project))):
+            start = time.perf_counter()
+            first, size = run()
+            total = time.perf_counter() - start
+            # Memory in a second pass: tracemalloc slows the timed run down
+            tracemalloc.start()
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  {label:26} first byte {first * 1000:8.1f}ms  total {total:6.2f}s  "
+                  f"peak {peak / 2**20:7.1f} MiB  body {size / 2**20:6.1f} MiB")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Requirement listing cost on a large project: the old unbounded listing
+against keyset pages, near the start and deep into the project, with and
+without a field projection. Reports latency and peak Python memory per call.
+
+    python scripts/bench_listing.py --requirements 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.api.endpoints.requirements import list_requirements
+from app.api.pagination import encode_cursor
+from app.db.session import Base, create_db_engine
+from app.models import models
+from app.schemas import schemas
+
+
+def measure(label, fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = fn()
+        timings.append(time.perf_counter() - start)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(f"  {label:38} {min(timings) * 1000:8.1f}ms  peak {peak / 2**20:7.1f} MiB  ({rows} rows)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requirements", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'listing.db')}")
+        Base.metadata.create_all(bind=engine)
+        project_id, now = uuid4(), datetime.utcnow()
+        rows = [{
+            "id": uuid4(), "project_id": project_id, "stakeholder_id": None, "text": f"The system must support workflow {i}",
+            "source_type": "slack", "source_ref": None, "category": "functional", "priority_score": 0.5,
+            "sentiment_score": 0.0, "status": "extracted", "created_at": now - timedelta(seconds=i)
+        } for i in range(args.requirements)]
+        with engine.begin() as connection:
+            connection.execute(insert(models.Project), [{"id": project_id, "name": "listing"}])
+            connection.execute(insert(models.Requirement), rows)
+            connection.exec_driver_sql("ANALYZE")
+        deep = rows[int(args.requirements * 0.9)]
+        deep_cursor = encode_cursor(deep["created_at"], deep["id"])
+        del rows
+
+        db = sessionmaker(bind=engine)()
+
+        def unbounded():
+            # The previous endpoint: every requirement as an ORM object, then serialized
+            requirements = db.query(models.Requirement).filter(models.Requirement.project_id == project_id).all()
+            body = [schemas.Requirement.model_validate(r).model_dump(mode="json") for r in requirements]
+            db.expunge_all()
+            return len(body)
+
+        def page(cursor=None, fields=None):
+            def run():
+                result = list_requirements(db, project_id, cursor, args.limit, fields, None, None, None, None)
+                body = schemas.RequirementPage.model_validate(result).model_dump(mode="json", exclude_unset=True)
+                db.expunge_all()
+                return len(body["items"])
+            return run
+
+        print(f"{args.requirements:,} requirements in one project, pages of {args.limit}")
+        measure("unbounded listing (before)", unbounded, repeat=2)
+        measure("first page", page())
+        measure("page at 90% depth", page(deep_cursor))
+        measure("page at 90% depth, fields=id,text", page(deep_cursor, "id,text"))
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
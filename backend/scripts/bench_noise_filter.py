@@ -0,0 +1,64 @@
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.utils.noise_filter import NoiseFilter
+
+WORDS = (
+    "the team will review the quarterly numbers and send an update about the pipeline "
+    "contract trading desk gas power west region forecast schedule call tomorrow please "
+    "attached document revised draft comments legal counterparty credit approval"
+).split()
+SPRINKLES = [
+    "lunch", "Happy Hour", "coffee", "THANKS", "best regards", "weekend", "newsletter",
+    "meeting room booked", "order confirmation", "requirement", "DEADLINE", "budget",
+    "scope", "Stakeholder", "must have", "decision", "RİSK", "ſcope", "gymilestone",
+]
+
+
+def legacy_is_noise(text: str) -> bool:
+    """The original implementation: one re.search per pattern on lowercased text."""
+    text_lower = text.lower()
+    if len(text.strip()) < 30:
+        return True
+    if any(re.search(pattern, text_lower) for pattern in NoiseFilter.SIGNAL_PATTERNS):
+        return False
+    noise_matches = sum(1 for pattern in NoiseFilter.NOISE_PATTERNS if re.search(pattern, text_lower))
+    return noise_matches >= 1
+
+
+def make_corpus(n: int, seed: int = 11):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(3, 120))]
+        for _ in range(rng.randint(0, 2)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(SPRINKLES))
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def run(n: int = 50_000):
+    corpus = make_corpus(n)
+
+    start = time.perf_counter()
+    expected = [legacy_is_noise(t) for t in corpus]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [NoiseFilter.is_noise(t) for t in corpus]
+    new_time = time.perf_counter() - start
+
+    assert actual == expected, "Classification changed"
+    assert NoiseFilter.filter_batch(corpus) == [t for t, noise in zip(corpus, expected) if not noise]
+
+    print(f"✅ Identical classification on {n} messages ({sum(expected)} noise)")
+    print(f"⏱️  legacy: {legacy_time:.3f}s | compiled: {new_time:.3f}s | speedup: {legacy_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    run()
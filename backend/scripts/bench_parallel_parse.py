@@ -0,0 +1,60 @@
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.connectors.enron import EnronConnector
+from app.utils.batch_parser import parse_in_batches
+from scripts.bench_noise_filter import make_corpus
+
+
+def make_emails(n: int):
+    return [
+        {"subject": f"Re: desk update {i}", "sender": f"user{i % 500}@enron.com", "body": body}
+        for i, body in enumerate(make_corpus(n))
+    ]
+
+
+async def heartbeat(stop: asyncio.Event, gaps: list):
+    # Measures how long the event loop goes without being able to run us
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.01)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+
+async def timed_parse(emails, workers: int):
+    stop = asyncio.Event()
+    gaps = []
+    beat = asyncio.create_task(heartbeat(stop, gaps))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        start = time.perf_counter()
+        texts = [t async for t in parse_in_batches(
+            emails, EnronConnector.parse_batch, chunk_size=2000, executor=pool, max_in_flight=2 * workers
+        )]
+        elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    return texts, elapsed, max(gaps, default=0.0)
+
+
+async def run(n: int = 200_000):
+    emails = make_emails(n)
+
+    start = time.perf_counter()
+    expected = EnronConnector.parse_batch(emails)
+    print(f"⏱️  inline (blocks the loop): {time.perf_counter() - start:.2f}s")
+
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        texts, elapsed, worst_gap = await timed_parse(emails, workers)
+        assert texts == expected, "Order or content changed"
+        print(f"⏱️  {workers:>2} workers: {elapsed:.2f}s | longest event-loop stall: {worst_gap * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -36,7 +36,7 @@ def test_ingestion_flow():
     # 3. Check requirements
     response = requests.get(f"{BASE_URL}/requirements/project/{project_id}")
     if response.status_code == 200:
-        reqs = response.json()
+        reqs = response.json()["items"]
         print(f"Extracted {len(reqs)} requirements:")
         for r in reqs:
             print(f"- [{r['category']}] {r['text']}")
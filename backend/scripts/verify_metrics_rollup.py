@@ -0,0 +1,213 @@
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.session import Base, create_db_engine
+from app.models import models
+from app.services.metrics import REVISION_WINDOW_DAYS, ProjectMetricsService, _batch_stats, _merge, _subtract
+from app.services.requirement_updates import RequirementUpdateService
+
+TOLERANCE = 1e-9
+
+
+def close(a, b, what):
+    assert abs(a - b) <= TOLERANCE * max(1.0, abs(a), abs(b)), f"{what}: {a} vs {b}"
+
+
+def same_stats(actual, expected, what):
+    assert actual[0] == expected[0], f"{what}: count {actual[0]} vs {expected[0]}"
+    close(actual[1], expected[1], f"{what}: mean")
+    close(actual[2], expected[2], f"{what}: M2")
+
+
+def check_combinators(rng, rounds=2_000):
+    """_merge and _subtract against summaries computed from the raw values."""
+    for _ in range(rounds):
+        a = [rng.uniform(-1, 1) for _ in range(rng.randint(0, 40))]
+        b = [rng.uniform(-1, 1) for _ in range(rng.randint(0, 40))]
+        whole = _batch_stats(a + b)
+        same_stats(_merge(*_batch_stats(a), *_batch_stats(b)), whole, "merge")
+        if a:
+            same_stats(_subtract(*whole, *_batch_stats(b)), _batch_stats(a), "subtract")
+        # Removing everything (or more) empties the summary
+        assert _subtract(*whole, *whole) == (0, 0.0, 0.0)
+    print(f"✅ _merge/_subtract match direct summaries over {rounds} random splits")
+
+
+def snapshot(project_id, db: Session):
+    metrics = db.get(models.ProjectMetrics, project_id)
+    db.refresh(metrics)
+    # rebuild() only recreates buckets inside the window, the only ones ever read
+    since = datetime.utcnow().date() - timedelta(days=REVISION_WINDOW_DAYS)
+    buckets = {
+        b.day: b.revision_count for b in db.query(models.ProjectRevisionBucket).filter(
+            models.ProjectRevisionBucket.project_id == project_id,
+            models.ProjectRevisionBucket.day >= since,
+            models.ProjectRevisionBucket.revision_count > 0
+        )
+    }
+    return {
+        "requirement_count": metrics.requirement_count,
+        "sentiment_mean": metrics.sentiment_mean,
+        "sentiment_m2": metrics.sentiment_m2,
+        "unresolved_conflict_count": metrics.unresolved_conflict_count,
+        "unresolved_severity_sum": metrics.unresolved_severity_sum,
+        "buckets": buckets,
+        "recent_revisions": ProjectMetricsService.recent_revision_count(project_id, db)
+    }
+
+
+def rebuilt(project_id, engine):
+    """
+    What rebuild() computes from the raw tables, without replacing the
+    incremental rollup: it runs on a savepoint that is rolled back afterwards.
+    """
+    with engine.connect() as connection:
+        outer = connection.begin()
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            ProjectMetricsService.rebuild(project_id, db)
+            return snapshot(project_id, db)
+        finally:
+            db.close()
+            outer.rollback()
+
+
+def compare(project_id, db, engine, step):
+    actual, expected = snapshot(project_id, db), rebuilt(project_id, engine)
+    for key in ("requirement_count", "unresolved_conflict_count", "buckets", "recent_revisions"):
+        assert actual[key] == expected[key], f"after {step}: {key} {actual[key]} vs {expected[key]}"
+    for key in ("sentiment_mean", "sentiment_m2", "unresolved_severity_sum"):
+        close(actual[key], expected[key], f"after {step}: {key}")
+
+
+def check_untracked(engine, rng):
+    """
+    A project with data but no metrics row yet: its first write, ORM or Core,
+    builds the row in its own transaction instead of being dropped.
+    """
+    db = sessionmaker(bind=engine, autoflush=False)()
+    for write in ("orm", "core"):
+        project = models.Project(name=f"untracked-{write}")
+        db.add(project)
+        db.commit()
+        rows = [{"project_id": project.id, "text": f"old {i}", "sentiment_score": score(rng),
+                 "created_at": datetime.utcnow()} for i in range(20)]
+        db.execute(insert(models.Requirement).execution_options(render_nulls=True), rows)
+        db.query(models.ProjectMetrics).filter(models.ProjectMetrics.project_id == project.id).delete()
+        db.commit()
+
+        if write == "orm":
+            db.add_all([models.Requirement(project_id=project.id, text=f"new {i}", sentiment_score=score(rng)) for i in range(5)])
+        else:
+            rows = [{"project_id": project.id, "text": f"new {i}", "sentiment_score": score(rng),
+                     "created_at": datetime.utcnow()} for i in range(5)]
+            db.execute(insert(models.Requirement).execution_options(render_nulls=True), rows)
+            ProjectMetricsService.add_requirements(db, project.id, [row["sentiment_score"] for row in rows])
+        db.commit()
+        assert db.get(models.ProjectMetrics, project.id) is not None, f"{write} write left the project untracked"
+        compare(project.id, db, engine, f"first {write} write to an untracked project")
+    db.close()
+    print("✅ the first ORM and Core writes to an untracked project build its rollup")
+
+
+def score(rng):
+    return None if rng.random() < 0.1 else rng.uniform(-1, 1)
+
+
+def run(steps=300, seed=11):
+    rng = random.Random(seed)
+    check_combinators(rng)
+
+    engine = create_db_engine(f"sqlite:///{tempfile.mkdtemp()}/metrics.db")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+
+    project = models.Project(name="verify-rollup")
+    db.add(project)
+    db.commit()
+    project_id = project.id
+    # Start tracking; from here on every write goes through the incremental path
+    ProjectMetricsService.rebuild(project_id, db)
+
+    counts = {}
+    for step in range(steps):
+        requirements = db.query(models.Requirement).filter(models.Requirement.project_id == project_id).all()
+        conflicts = db.query(models.Conflict).filter(models.Conflict.project_id == project_id).all()
+        with_revisions = {rid for (rid,) in db.query(models.RequirementRevision.requirement_id).distinct()}
+        operation = rng.choice(["add", "bulk_add", "update", "bulk_update", "delete", "conflict", "resolve", "drop_conflict"])
+        if operation in ("update", "bulk_update", "delete", "conflict") and len(requirements) < 2:
+            operation = "add"
+
+        if operation == "add":
+            # ORM inserts: folded in by the before_flush hook
+            db.add_all([
+                models.Requirement(project_id=project_id, text=f"req {step}-{i}", sentiment_score=score(rng))
+                for i in range(rng.randint(1, 20))
+            ])
+        elif operation == "bulk_add":
+            # Core inserts, as the bulk import writes them: the caller updates the rollup
+            rows = [{"project_id": project_id, "text": f"bulk {step}-{i}", "sentiment_score": score(rng),
+                     "created_at": datetime.utcnow()} for i in range(rng.randint(1, 50))]
+            db.execute(insert(models.Requirement).execution_options(render_nulls=True), rows)
+            ProjectMetricsService.add_requirements(db, project_id, [row["sentiment_score"] for row in rows])
+        elif operation == "update":
+            # ORM updates: the hook removes the old score and adds the new one
+            for requirement in rng.sample(requirements, rng.randint(1, min(10, len(requirements)))):
+                requirement.sentiment_score = score(rng)
+                if rng.random() < 0.5:
+                    db.add(models.RequirementRevision(
+                        requirement=requirement, field_changed="sentiment_score", old_value="", new_value="",
+                        created_at=datetime.utcnow() - timedelta(days=rng.randint(0, 40))
+                    ))
+        elif operation == "bulk_update":
+            # Bulk UPDATE + Core revision inserts through the update service
+            targets = rng.sample(requirements, rng.randint(1, min(20, len(requirements))))
+            RequirementUpdateService.apply(
+                {r.id: {"sentiment_score": rng.uniform(-1, 1), "priority_score": rng.uniform(0, 10)} for r in targets}, db
+            )
+        elif operation == "delete":
+            # Requirements without revisions (a revision delete would need its own bucket update)
+            candidates = [r for r in requirements if r.id not in with_revisions]
+            for requirement in rng.sample(candidates, min(len(candidates), rng.randint(1, 5))):
+                for conflict in conflicts:
+                    if requirement.id in (conflict.req_a_id, conflict.req_b_id):
+                        db.delete(conflict)
+                db.delete(requirement)
+        elif operation == "conflict":
+            a, b = rng.sample(requirements, 2)
+            db.add(models.Conflict(
+                project_id=project_id, req_a_id=a.id, req_b_id=b.id, conflict_type="timeline",
+                severity_score=rng.choice([None, 0.0, rng.random()]), is_resolved=rng.random() < 0.2
+            ))
+        elif operation == "resolve" and conflicts:
+            conflict = rng.choice(conflicts)
+            if rng.random() < 0.5:
+                conflict.is_resolved = not conflict.is_resolved
+            else:
+                conflict.severity_score = rng.choice([None, 0.0, rng.random()])
+        elif operation == "drop_conflict" and conflicts:
+            db.delete(rng.choice(conflicts))
+
+        db.commit()
+        counts[operation] = counts.get(operation, 0) + 1
+        compare(project_id, db, engine, f"step {step} ({operation})")
+
+    check_untracked(engine, rng)
+
+    final = snapshot(project_id, db)
+    print(f"✅ incremental rollup equals rebuild() after each of {steps} steps: "
+          + ", ".join(f"{op} x{n}" for op, n in sorted(counts.items())))
+    print(f"   {final['requirement_count']} requirements, {final['unresolved_conflict_count']} open conflicts, "
+          f"{sum(final['buckets'].values())} revisions in the window")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,104 @@
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models import models
+from app.services.intelligence import IntelligenceService
+from app.api.endpoints.sentiment import get_sentiment_overview
+
+SOURCES = ["slack", "gmail", "enron", "ami", "document", None]
+
+
+def legacy_alignment_score(project_id, db):
+    """The original implementation: load every row and aggregate in Python."""
+    requirements = db.query(models.Requirement).filter(models.Requirement.project_id == project_id).all()
+    if not requirements:
+        return 100.0
+    conflicts = db.query(models.Conflict).filter(models.Conflict.project_id == project_id, models.Conflict.is_resolved == False).all()
+    conflict_impact = 0.0
+    for conflict in conflicts:
+        conflict_impact += (conflict.severity_score or 0.5) * 1.2
+    sentiments = [r.sentiment_score for r in requirements]
+    sentiment_variance = statistics.variance(sentiments) if len(sentiments) > 1 else 0.0
+    sas = 100 * (1 - (conflict_impact + (sentiment_variance * 5)) / (len(requirements) * 2))
+    return max(min(sas, 100.0), 0.0)
+
+
+def legacy_overall_sentiment(project_id, db):
+    requirements = db.query(models.Requirement).filter(models.Requirement.project_id == project_id).all()
+    return round(sum(r.sentiment_score for r in requirements) / len(requirements), 2) if requirements else 0.0
+
+
+def legacy_channel_breakdown(project_id, db):
+    groups = {}
+    for r in db.query(models.Requirement).filter(models.Requirement.project_id == project_id).all():
+        groups.setdefault(r.source_type or "unknown", []).append(r.sentiment_score)
+    return {k: round(sum(v) / len(v), 2) for k, v in groups.items()}
+
+
+def seed(db, n_requirements, n_conflicts, seed=7):
+    rng = random.Random(seed)
+    project = models.Project(name=f"verify-{n_requirements}")
+    db.add(project)
+    db.commit()
+    rows = [{
+        "project_id": project.id,
+        "text": f"requirement {i}",
+        "source_type": rng.choice(SOURCES),
+        "sentiment_score": rng.uniform(-1, 1)
+    } for i in range(n_requirements)]
+    for start in range(0, len(rows), 10_000):
+        db.execute(insert(models.Requirement).execution_options(render_nulls=True), rows[start:start + 10_000])
+    db.execute(insert(models.Conflict).execution_options(render_nulls=True), [{
+        "project_id": project.id,
+        "severity_score": rng.choice([None, 0.0, rng.random()]),
+        "is_resolved": rng.random() < 0.3
+    } for _ in range(n_conflicts)])
+    db.commit()
+    return project.id
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def run(sizes=(10, 1_000, 100_000)):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    for n in sizes:
+        project_id = seed(db, n, n // 10 + 1)
+        db.expunge_all()
+
+        expected, legacy_time, legacy_mb = measure(legacy_alignment_score, project_id, db)
+        db.expunge_all()
+        actual, sql_time, sql_mb = measure(IntelligenceService.calculate_alignment_score, project_id, db)
+        assert abs(actual - expected) < 1e-9, f"SAS differs at n={n}: {actual} vs {expected}"
+
+        overview = get_sentiment_overview(project_id, db, None)
+        assert overview["overall_sentiment"] == legacy_overall_sentiment(project_id, db), "overall sentiment differs"
+        assert overview["channel_breakdown"] == legacy_channel_breakdown(project_id, db), "channel breakdown differs"
+        db.expunge_all()
+
+        print(f"✅ n={n}: SAS {actual:.6f} (|Δ| {abs(actual - expected):.1e}), sentiment overview identical")
+        print(f"   legacy {legacy_time * 1000:.0f}ms / {legacy_mb:.1f}MB peak | SQL {sql_time * 1000:.0f}ms / {sql_mb:.2f}MB peak")
+
+
+if __name__ == "__main__":
+    run()
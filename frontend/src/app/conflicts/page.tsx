@@ -28,10 +28,10 @@ export default function ConflictsPage() {
 
                 if (projects && projects.length > 0) {
                     const projectId = projects[0].id;
-                    // 2. Fetch conflicts for this project
-                    const cRes = await fetch(`http://localhost:8000/api/v1/conflicts/project/${projectId}`);
+                    // 2. Fetch open conflicts for this project (first page, newest first)
+                    const cRes = await fetch(`http://localhost:8000/api/v1/conflicts/project/${projectId}?limit=100`);
                     const data = await cRes.json();
-                    setConflicts(data);
+                    setConflicts(data.items ?? []);
                 }
             } catch (err) {
                 console.error("Error fetching conflicts:", err);
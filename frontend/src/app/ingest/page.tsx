@@ -107,10 +107,23 @@ export default function IngestPage() {
             });
 
             if (res.ok) {
-                const data = await res.json();
+                // Ingestion runs as a background job; poll until it settles
+                let job = await res.json();
+                while (job.status === "queued" || job.status === "running") {
+                    setProgress(Math.round((job.progress || 0) * 100));
+                    await new Promise(r => setTimeout(r, 1000));
+                    const jobRes = await fetch(`http://localhost:8000/api/v1/ingest/jobs/${job.job_id}`);
+                    job = await jobRes.json();
+                }
+
+                if (job.status !== "succeeded") {
+                    setNotification(`Error: ${job.error || `Ingestion ${job.status}`}`);
+                    setStatus("error");
+                    return;
+                }
                 setResults({
-                    requirements: data.requirements || 0,
-                    conflicts: data.conflicts || 0
+                    requirements: job.result?.requirements_extracted || 0,
+                    conflicts: job.result?.conflicts_detected || 0
                 });
                 setStatus("complete");
                 setNotification(`Successfully ingested real data from ${type.toUpperCase()}!`);
@@ -63,18 +63,42 @@ export default function RequirementsPage() {
     const [requirements, setRequirements] = useState<any[]>([]);
     const [loading, setLoading] = useState(true);
 
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+
+    // One keyset page of the listing; pass the previous page's next_cursor for the following one
+    const fetchRequirementsPage = async (cursor?: string | null) => {
+        const params = new URLSearchParams({ limit: "100" });
+        if (cursor) params.set("cursor", cursor);
+        const response = await fetch(`http://localhost:8000/api/v1/requirements/?${params}`);
+        const data = await response.json();
+        if (!Array.isArray(data?.items)) {
+            throw new Error(`Unexpected requirements response: ${JSON.stringify(data)}`);
+        }
+        return data as { items: any[]; next_cursor: string | null };
+    };
+
+    const loadMore = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const page = await fetchRequirementsPage(nextCursor);
+            setRequirements(prev => [...prev, ...page.items]);
+            setNextCursor(page.next_cursor);
+        } catch (error) {
+            console.error("Failed to fetch more requirements:", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     React.useEffect(() => {
         const fetchRequirements = async () => {
             try {
                 // In a real app, we'd use the project ID from the context or URL
-                const response = await fetch("http://localhost:8000/api/v1/requirements/");
-                const data = await response.json();
-                if (Array.isArray(data)) {
-                    setRequirements(data);
-                } else {
-                    console.error("API did not return an array:", data);
-                    setRequirements([]); // Fallback to empty if not an array
-                }
+                const page = await fetchRequirementsPage();
+                setRequirements(page.items);
+                setNextCursor(page.next_cursor);
             } catch (error) {
                 console.error("Failed to fetch requirements:", error);
                 // Fallback to mock for demo stability if API fails
@@ -106,9 +130,9 @@ export default function RequirementsPage() {
             if (data.status === "success") {
                 setSeedSuccess(true);
                 // Refresh data
-                const refreshResponse = await fetch("http://localhost:8000/api/v1/requirements/");
-                const refreshData = await refreshResponse.json();
-                if (Array.isArray(refreshData)) setRequirements(refreshData);
+                const page = await fetchRequirementsPage();
+                setRequirements(page.items);
+                setNextCursor(page.next_cursor);
                 setTimeout(() => setSeedSuccess(false), 5000);
             }
         } catch (error) {
@@ -315,7 +339,8 @@ export default function RequirementsPage() {
                         </motion.div>
                     </div>
                 ) : (
-                    filteredRequirements.map((req) => (
+                    <>
+                    {filteredRequirements.map((req) => (
                         <motion.div
                             whileHover={{ x: 5 }}
                             key={req.id}
@@ -372,7 +397,17 @@ export default function RequirementsPage() {
                                 </div>
                             </div>
                         </motion.div>
-                    ))
+                    ))}
+                    {nextCursor && (
+                        <button
+                            onClick={loadMore}
+                            disabled={loadingMore}
+                            className="w-full py-3 border rounded-2xl text-sm font-bold text-muted-foreground hover:bg-slate-50 transition-colors disabled:opacity-50"
+                        >
+                            {loadingMore ? "Loading..." : "Load more requirements"}
+                        </button>
+                    )}
+                    </>
                 )}
             </div>
         </div>